@@ -0,0 +1,274 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from OBJ import OBJ
+from ObjParser import timed_parse_obj
+
+# Poniżej tej łącznej wielkości plików .obj parsowanie szeregowe jest szybsze niż
+# start procesów: ok. 3 MB/s parsowania wobec 1.5-3 s na zimny start puli
+PARALLEL_MIN_BYTES = 8 * 1024 ** 2
+
+# Pula procesów utrzymywana między wczytaniami: (liczba procesów, ProcessPoolExecutor)
+_pool = None
+
+
+def get_pool(max_workers):
+    """
+    Return the process pool for parsing, starting it on first use.
+
+    The pool is kept alive across loads, so long-lived processes pay the worker
+    start-up (a fresh interpreter that re-imports the __main__ module) only once.
+
+    Parameters:
+    - max_workers (int): Number of worker processes.
+
+    Returns:
+    ProcessPoolExecutor: The pool.
+    """
+    global _pool
+    if _pool is None or _pool[0] != max_workers:
+        shutdown_pool()
+        # Spawn instead of fork, so workers do not inherit the display connection and GL context
+        context = multiprocessing.get_context("spawn")
+        _pool = (max_workers, ProcessPoolExecutor(max_workers=max_workers, mp_context=context))
+    return _pool[1]
+
+
+def shutdown_pool():
+    """
+    Stop the parsing pool, if running.
+
+    Returns:
+    None
+    """
+    global _pool
+    if _pool is not None:
+        _pool[1].shutdown()
+        _pool = None
+
+
+def parse_objects_parallel(keys, max_workers=None, reorder=False):
+    """
+    Parse OBJ files in a process pool, yielding each result as soon as it is ready.
+
+    Parameters:
+    - keys (list): Distinct (filename, swapyz) pairs to parse.
+    - max_workers (int): Number of worker processes. By default the files are
+      parsed serially if they are smaller than PARALLEL_MIN_BYTES in total or there
+      is one CPU, and with one process per CPU otherwise; 0 or 1 parses serially in
+      this process.
+    - reorder (bool): If True, reorder the mesh triangles for the vertex cache (Tipsify).
+
+    Yields:
+    tuple: ((filename, swapyz), parsed data from parse_obj, parse time in seconds).
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+        if sum(os.path.getsize(filename) for filename in set(key[0] for key in keys)) < PARALLEL_MIN_BYTES:
+            max_workers = 1
+
+    if max_workers <= 1:
+        for key in keys:
+            yield (key, *timed_parse_obj(*key, reorder))
+        return
+
+    pool = get_pool(max_workers)
+    futures = {pool.submit(timed_parse_obj, *key, reorder): key for key in keys}
+    for future in as_completed(futures):
+        yield (futures[future], *future.result())
+
+
+def load_objects_parallel(objects_data, max_workers=None, reorder=False):
+    """
+    Load objects, parsing meshes and decoding textures in a process pool.
+
+    Each distinct (filename, swapyz) pair is parsed once in a worker process. OpenGL
+    uploads happen here, on the thread owning the GL context, as soon as each parse
+    finishes, so they overlap with the parsing of the remaining files.
+
+    Parameters:
+    - objects_data (list): Object descriptions as found in objects.json.
+    - max_workers (int): Number of worker processes; see parse_objects_parallel.
+    - reorder (bool): If True, reorder the mesh triangles for the vertex cache (Tipsify).
+
+    Returns:
+    tuple: (list of OBJ objects in the order of objects_data, list of timing dicts
+    with 'filename', 'swapyz', 'parse' and 'upload' times in seconds).
+    """
+    keys = []
+    for obj_data in objects_data:
+        key = (obj_data["filename"], obj_data.get("swapyz", False))
+        if key not in keys:
+            keys.append(key)
+
+    objects = [None] * len(objects_data)
+    timings = []
+    for key, parsed, parse_time in parse_objects_parallel(keys, max_workers, reorder):
+        start = time.perf_counter()
+        for i, obj_data in enumerate(objects_data):
+            if (obj_data["filename"], obj_data.get("swapyz", False)) == key:
+                objects[i] = OBJ(key[0], key[1], obj_data.get("position"), obj_data.get("rotation"),
+                                 parsed=parsed)
+        timings.append({'filename': key[0], 'swapyz': key[1], 'parse': parse_time,
+                        'upload': time.perf_counter() - start})
+
+    return objects, timings
+
+
+def print_load_report(timings, total_time):
+    """
+    Print per-asset load timings.
+
+    Parameters:
+    - timings (list): Timing dicts as returned by load_objects_parallel or
+      AssetCache.load; files that were already parsed have no 'parse' entry.
+    - total_time (float): Wall-clock time of the whole load in seconds.
+
+    Returns:
+    None
+    """
+    for timing in timings:
+        if 'parse' in timing:
+            line = f"[load] {timing['filename']} (swapyz={timing['swapyz']}): parse {timing['parse'] * 1000:.1f} ms"
+        else:
+            line = f"[load] {timing['filename']} (swapyz={timing['swapyz']}): parse cached"
+        print(f"{line}, upload {timing['upload'] * 1000:.1f} ms")
+    parse_sum = sum(timing.get('parse', 0) for timing in timings)
+    print(f"[load] {len(timings)} assets in {total_time * 1000:.1f} ms "
+          f"(sum of parse times {parse_sum * 1000:.1f} ms)")
+
+
+class AssetCache:
+    """
+    Keeps loaded objects alive between scenes rendered by one process.
+
+    Parsed meshes (with their uploaded buffers and textures) are cached per
+    (filename, swapyz), and OBJ objects per full placement, because every object
+    carries its own position (baked into the display list when there is one). A
+    file is parsed again only if it changed on disk; the GPU data of the old parse
+    and all objects built from it are freed then.
+
+    Attributes:
+    - reorder (bool): Whether meshes are reordered for the vertex cache when parsed.
+    - parsed (dict): (filename, swapyz) -> (mtime, parsed data).
+    - objects (dict): Placement key -> OBJ object.
+    - hits (int): Number of objects served from the cache.
+    - misses (int): Number of objects that had to be built.
+
+    Methods:
+    - load(self, objects_data, max_workers=None): Return OBJ objects for a scene description.
+    - clear(self): Free all cached objects and their GPU data.
+    """
+
+    def __init__(self, reorder=False):
+        """
+        Initializes an empty AssetCache.
+
+        Parameters:
+        - reorder (bool): If True, reorder the mesh triangles for the vertex cache (Tipsify).
+        """
+        self.reorder = reorder
+        self.parsed = {}
+        self.objects = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, objects_data, max_workers=None):
+        """
+        Return OBJ objects for a scene description, loading only what is not cached.
+
+        Parameters:
+        - objects_data (list): Object descriptions as found in objects.json.
+        - max_workers (int): Number of parsing processes for the missing files.
+
+        Returns:
+        tuple: (list of OBJ objects in the order of objects_data, list of timing dicts
+        with 'filename', 'swapyz' and 'upload' for the files objects were built from,
+        and 'parse' if the file was parsed by this call).
+        """
+        result = [None] * len(objects_data)
+        to_parse = []
+        for i, obj_data in enumerate(objects_data):
+            key = _placement_key(obj_data)
+            obj = self.objects.get(key)
+            if obj is not None and self._is_fresh(obj_data):
+                self.hits += 1
+                result[i] = obj
+            else:
+                self.misses += 1
+                to_parse.append(i)
+
+        parse_keys = []
+        for i in to_parse:
+            obj_data = objects_data[i]
+            key = (obj_data["filename"], obj_data.get("swapyz", False))
+            if not self._is_fresh(obj_data) and key not in parse_keys:
+                parse_keys.append(key)
+
+        timings = {}
+        for key, parsed, parse_time in parse_objects_parallel(parse_keys, max_workers, self.reorder):
+            if key in self.parsed:
+                self._free_parsed(key)
+            self.parsed[key] = (os.path.getmtime(key[0]), parsed)
+            timings[key] = {'filename': key[0], 'swapyz': key[1], 'parse': parse_time, 'upload': 0.0}
+
+        built = {}
+        for i in to_parse:
+            obj_data = objects_data[i]
+            key = _placement_key(obj_data)
+            if key not in built:
+                start = time.perf_counter()
+                stale = self.objects.pop(key, None)
+                if stale is not None:
+                    stale.free()
+                parsed = self.parsed[key[:2]][1]
+                built[key] = self.objects[key] = OBJ(key[0], key[1], obj_data.get("position"),
+                                                     obj_data.get("rotation"), parsed=parsed)
+                timing = timings.setdefault(key[:2], {'filename': key[0], 'swapyz': key[1], 'upload': 0.0})
+                timing['upload'] += time.perf_counter() - start
+            result[i] = built[key]
+        return result, list(timings.values())
+
+    def clear(self):
+        """
+        Free all cached objects and their GPU data.
+
+        Returns:
+        None
+        """
+        for key in list(self.parsed):
+            self._free_parsed(key)
+
+    def _free_parsed(self, key):
+        """
+        Forget a parsed file, freeing its GPU data and every object built from it.
+
+        Parameters:
+        - key (tuple): The (filename, swapyz) pair.
+
+        Returns:
+        None
+        """
+        for placement in [placement for placement in self.objects if placement[:2] == key]:
+            self.objects.pop(placement).free()
+        OBJ.free_parsed(self.parsed.pop(key)[1])
+
+    def _is_fresh(self, obj_data):
+        entry = self.parsed.get((obj_data["filename"], obj_data.get("swapyz", False)))
+        return entry is not None and entry[0] == os.path.getmtime(obj_data["filename"])
+
+
+def _placement_key(obj_data):
+    """
+    Build the cache key of a placed object.
+
+    Parameters:
+    - obj_data (dict): Object description as found in objects.json.
+
+    Returns:
+    tuple: Hashable key.
+    """
+    return (obj_data["filename"], obj_data.get("swapyz", False),
+            tuple(obj_data.get("position") or ()), tuple(obj_data.get("rotation") or ()))
@@ -0,0 +1,126 @@
+from OpenGL.GL import *
+import os
+
+import numpy as np
+
+from Camera import iter_trajectory
+from Framebuffer import Framebuffer
+from FrameStream import frame_metadata
+from Profiler import profiler
+from main import DATASET_PROJECTION, VIEWPORT, camera_handle_input, camera_render_object, \
+    camera_setup_projection, save_frame, screenshot_path, write_manifest
+
+
+def atlas_layout(views, width, height, scale=1):
+    """
+    Choose a grid for packing views into one render target within the driver limits.
+
+    Parameters:
+    - views (int): The requested number of views per atlas.
+    - width (int): The width of one view in pixels.
+    - height (int): The height of one view in pixels.
+    - scale (int): Supersampling factor of the render target.
+
+    Returns:
+    tuple: (columns, rows) holding at most the requested number of views; fewer
+    if the driver limits do not allow for more or views has no fitting grid.
+    """
+    max_viewport = glGetIntegerv(GL_MAX_VIEWPORT_DIMS)
+    max_size = min(glGetIntegerv(GL_MAX_RENDERBUFFER_SIZE), max_viewport[0], max_viewport[1])
+    max_columns = max(1, max_size // (width * scale))
+    max_rows = max(1, max_size // (height * scale))
+    # Najwięcej widoków, a przy remisie siatka jak najbardziej kwadratowa
+    grids = [(columns, min(max_rows, views // columns)) for columns in range(1, min(max_columns, views) + 1)]
+    return max(grids, key=lambda grid: (grid[0] * grid[1], -abs(grid[0] - grid[1])))
+
+
+def iter_atlas_frames(objects, cameras, views=4, width=VIEWPORT[0], height=VIEWPORT[1], samples=0, supersample=1,
+                      projection_size=DATASET_PROJECTION):
+    """
+    Render the camera path once, drawing several consecutive poses into the
+    sub-viewports of one offscreen target and reading it back with a single call.
+
+    The atlas is cleared and read back once per pass, and every view is sliced out
+    of the readback as a NumPy view without copying.
+
+    Parameters:
+    - objects (list): A list of objects to render.
+    - cameras (list): A list of Camera objects. They are modified in place.
+    - views (int): Number of poses per atlas. Reduced if the atlas would exceed the
+      maximum viewport or renderbuffer size.
+    - width (int): The width of one view in pixels.
+    - height (int): The height of one view in pixels.
+    - samples (int): MSAA samples per pixel.
+    - supersample (int): Supersampling factor, a power of two.
+    - projection_size (tuple): The (width, height) whose aspect ratio the views are
+      projected with. Like every other dataset path, all views use the field of view
+      of the first camera.
+
+    Yields:
+    tuple: (read-only uint8 RGBA view of shape (height, width, 4) into the atlas
+    readback, bottom row first as returned by OpenGL, metadata dict).
+    """
+    columns, rows = atlas_layout(views, width, height, supersample)
+    views = columns * rows
+    framebuffer = Framebuffer(columns * width, rows * height, samples, supersample)
+    view_width, view_height = width * supersample, height * supersample
+    trajectory = iter_trajectory(cameras)
+    camera_setup_projection(cameras[0], *projection_size)
+
+    try:
+        while True:
+            framebuffer.bind()
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            metadata = []
+            with profiler.gpu_span("draw"):
+                for camera, frame in trajectory:
+                    camera_handle_input(camera)
+                    column, row = len(metadata) % columns, len(metadata) // columns
+                    glViewport(column * view_width, row * view_height, view_width, view_height)
+                    for obj in objects:
+                        camera_render_object(obj, camera)
+                    metadata.append(frame_metadata(camera, frame, objects))
+                    if len(metadata) == views:
+                        break
+            if not metadata:
+                return
+
+            with profiler.span("readback"):
+                pixels = framebuffer.read_pixels()
+            atlas = np.frombuffer(pixels, np.uint8).reshape(framebuffer.height, framebuffer.width, 4)
+            for index, meta in enumerate(metadata):
+                column, row = index % columns, index // columns
+                yield atlas[row * height:(row + 1) * height, column * width:(column + 1) * width], meta
+            profiler.tick()
+            if len(metadata) < views:
+                return
+    finally:
+        framebuffer.free()
+
+
+def render_with_some_cameras_atlas(objects, cameras, png_dir, views=4, samples=0, supersample=1):
+    """
+    Render the dataset like render_with_some_cameras_dataset, several poses per pass.
+
+    Every frame is rendered; frame caching and duplicate skipping are not supported.
+
+    Parameters:
+    - objects (list): A list of objects to render.
+    - cameras (list): A list of Camera objects.
+    - png_dir (str): The folder to save the screenshots to.
+    - views (int): Number of poses per atlas.
+    - samples (int): MSAA samples per pixel.
+    - supersample (int): Supersampling factor, a power of two.
+
+    Returns:
+    None
+    """
+    width, height = VIEWPORT
+    manifest = []
+    for image, meta in iter_atlas_frames(objects, cameras, views, width, height, samples, supersample):
+        filename = screenshot_path(png_dir, meta['camera_id'], meta['frame'])
+        save_frame(image.tobytes(), (width, height), filename)
+        manifest.append({'file': os.path.basename(filename), 'camera_id': meta['camera_id'], 'frame': meta['frame'],
+                         'position': meta['position'], 'direction': meta['direction'],
+                         'up_vector': meta['up_vector'], 'status': 'rendered'})
+    write_manifest(png_dir, manifest)
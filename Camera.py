@@ -1,3 +1,6 @@
+import math
+
+
 class Camera:
     def __init__(self, id, position, direction, up_vector, field_of_view, transition_frames):
         """
@@ -80,6 +83,47 @@ class Camera:
         self.view_matrix = self.calculate_view_matrix()
 
 
+def iter_trajectory(cameras):
+    """
+    Walk the camera path once, yielding every dataset frame.
+
+    Each camera is interpolated towards the next one over its transition_frames.
+    While a frame is being consumed the camera holds the pose to render; it is
+    moved to the next pose when the generator resumes.
+
+    Parameters:
+    - cameras (list): A list of Camera objects. They are modified in place.
+
+    Yields:
+    tuple: (Camera, frame number within its transition).
+    """
+    for index, camera in enumerate(cameras):
+        target_camera = cameras[(index + 1) % len(cameras)]
+        for frame in range(camera.transition_frames + 1):
+            yield camera, frame
+            camera.interpolate(target_camera, frame, camera.transition_frames)
+
+
+def pose_delta(position_a, view_matrix_a, position_b, view_matrix_b):
+    """
+    Measure how far apart two camera poses are.
+
+    Parameters:
+    - position_a (list): The position of the first camera.
+    - view_matrix_a (list): The view matrix of the first camera.
+    - position_b (list): The position of the second camera.
+    - view_matrix_b (list): The view matrix of the second camera.
+
+    Returns:
+    tuple: (distance between the positions, rotation angle between the views in degrees).
+    """
+    translation = sum((a_i - b_i) ** 2 for a_i, b_i in zip(position_a, position_b)) ** 0.5
+    # trace(Ra^T Rb) = 1 + 2 cos(angle) dla górnych lewych bloków 3x3
+    trace = sum(view_matrix_a[i] * view_matrix_b[i] for i in (0, 1, 2, 4, 5, 6, 8, 9, 10))
+    cos_angle = max(-1.0, min(1.0, (trace - 1) / 2))
+    return translation, math.degrees(math.acos(cos_angle))
+
+
 # Helper functions for vector operations
 def cross_product(a, b):
     """
@@ -0,0 +1,197 @@
+import pygame
+
+from Camera import pose_delta
+
+# Rozmiar miniatury dla dHash: 9 kolumn daje 8 porównań w każdym z 8 wierszy - 64 bity
+HASH_WIDTH, HASH_HEIGHT = 9, 8
+
+
+def perceptual_hash(buffer, size):
+    """
+    Compute a 64-bit difference hash (dHash) of an image.
+
+    The image is shrunk to 9x8 grey pixels; every bit tells whether a pixel is
+    brighter than its right neighbour. Near-identical images differ in few bits.
+
+    Parameters:
+    - buffer (bytes): RGBA pixels as returned by glReadPixels.
+    - size (tuple): The (width, height) of the image.
+
+    Returns:
+    int: The hash.
+    """
+    return surface_hash(pygame.image.fromstring(buffer, size, "RGBA"))
+
+
+def surface_hash(surface):
+    """
+    Compute the perceptual_hash of a pygame surface.
+
+    Parameters:
+    - surface (pygame.Surface): The image, 24 or 32 bits per pixel.
+
+    Returns:
+    int: The hash.
+    """
+    thumbnail = pygame.image.tostring(pygame.transform.smoothscale(surface, (HASH_WIDTH, HASH_HEIGHT)), "RGB")
+    grey = [thumbnail[i] * 299 + thumbnail[i + 1] * 587 + thumbnail[i + 2] * 114
+            for i in range(0, len(thumbnail), 3)]
+    value = 0
+    for row in range(HASH_HEIGHT):
+        for column in range(HASH_WIDTH - 1):
+            left = grey[row * HASH_WIDTH + column]
+            value = (value << 1) | (left > grey[row * HASH_WIDTH + column + 1])
+    return value
+
+
+def hamming_distance(hash_a, hash_b):
+    """
+    Count the bits in which two hashes differ.
+
+    Parameters:
+    - hash_a (int): The first hash.
+    - hash_b (int): The second hash.
+
+    Returns:
+    int: The number of differing bits.
+    """
+    return bin(hash_a ^ hash_b).count("1")
+
+
+class DuplicateFilter:
+    """
+    Detects near-duplicate frames along a camera trajectory.
+
+    Camera.interpolate moves a fixed fraction of the remaining distance every frame,
+    so the last frames of each transition barely change. Every frame is compared
+    with the last frame that was kept: before rendering by camera pose, and after
+    rendering by perceptual hash. Either check is off when its thresholds are None.
+
+    Attributes:
+    - max_translation (float): Frames that moved less than this distance and
+      turned less than max_rotation are pose duplicates.
+    - max_rotation (float): Rotation threshold in degrees.
+    - max_hash_distance (int): Frames whose hash differs in at most this many bits
+      are image duplicates.
+    - last_file (str): The last kept frame.
+    - skipped (dict): Number of frames skipped since the last reset, by reason.
+
+    Methods:
+    - reset(self): Forget the last kept frame and the counts, e.g. before a new trajectory.
+    - same_pose(self, camera): Check the pose against the last kept frame.
+    - same_image(self, buffer, size): Check a rendered image against the last kept frame.
+    - keep(self, camera, filename): Make a frame the reference for the next ones.
+    - keep_file(self, camera, filename): Same for a frame that was not rendered.
+    - report(self): Print the number of skipped frames.
+    """
+
+    def __init__(self, max_translation=None, max_rotation=None, max_hash_distance=None):
+        """
+        Initializes a DuplicateFilter object.
+
+        Parameters:
+        - max_translation (float): Translation threshold in scene units.
+        - max_rotation (float): Rotation threshold in degrees.
+        - max_hash_distance (int): Hamming distance threshold, 0 to 64.
+        """
+        self.max_translation = max_translation
+        self.max_rotation = max_rotation
+        self.max_hash_distance = max_hash_distance
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the last kept frame and the skip counts.
+
+        Returns:
+        None
+        """
+        self.skipped = {'pose': 0, 'phash': 0}
+        self.last_pose = None
+        self.last_hash = None
+        self.last_file = None
+        self.pending_hash = None
+
+    def same_pose(self, camera):
+        """
+        Check whether the camera barely moved since the last kept frame.
+
+        Parameters:
+        - camera (Camera): The camera of the next frame.
+
+        Returns:
+        tuple: (True if the frame can be skipped, metrics dict with 'translation'
+        and 'rotation').
+        """
+        if self.max_translation is None or self.last_pose is None:
+            return False, None
+        translation, rotation = pose_delta(*self.last_pose, camera.position, camera.view_matrix)
+        metrics = {'translation': translation, 'rotation': rotation}
+        if translation < self.max_translation and rotation < self.max_rotation:
+            self.skipped['pose'] += 1
+            return True, metrics
+        return False, metrics
+
+    def same_image(self, buffer, size):
+        """
+        Check whether a rendered image is nearly identical to the last kept frame.
+
+        Parameters:
+        - buffer (bytes): RGBA pixels as returned by glReadPixels.
+        - size (tuple): The (width, height) of the image.
+
+        Returns:
+        tuple: (True if the frame can be dropped, Hamming distance or None).
+        """
+        if self.max_hash_distance is None:
+            return False, None
+        self.pending_hash = perceptual_hash(buffer, size)
+        if self.last_hash is None:
+            return False, None
+        distance = hamming_distance(self.last_hash, self.pending_hash)
+        if distance <= self.max_hash_distance:
+            self.skipped['phash'] += 1
+            return True, distance
+        return False, distance
+
+    def keep(self, camera, filename):
+        """
+        Make a frame the reference the next frames are compared with.
+
+        Parameters:
+        - camera (Camera): The camera of the kept frame.
+        - filename (str): The file of the kept frame.
+
+        Returns:
+        None
+        """
+        self.last_pose = (list(camera.position), list(camera.view_matrix))
+        self.last_hash = self.pending_hash
+        self.pending_hash = None
+        self.last_file = filename
+
+    def keep_file(self, camera, filename):
+        """
+        Make a frame that was not rendered, e.g. one taken from the frame cache, the
+        reference the next frames are compared with.
+
+        Parameters:
+        - camera (Camera): The camera of the frame.
+        - filename (str): The image file of the frame.
+
+        Returns:
+        None
+        """
+        if self.max_hash_distance is not None:
+            # Ten sam wynik co dla wyrenderowanej klatki, z dokładnością do strat JPEG
+            self.pending_hash = surface_hash(pygame.image.load(filename))
+        self.keep(camera, filename)
+
+    def report(self):
+        """
+        Print the number of skipped frames.
+
+        Returns:
+        None
+        """
+        print(f"[dedup] skipped {self.skipped['pose']} frames by pose, {self.skipped['phash']} by image hash")
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import shutil
+
+# Zmienić przy każdej zmianie sposobu renderowania, która zmienia wynikowe obrazy
+CACHE_VERSION = 1
+
+# Skróty plików modeli: ścieżka -> (stan wszystkich użytych plików, skrót)
+_asset_digests = {}
+
+
+def _file_stamp(filename):
+    """
+    Return what identifies a version of a file without reading it.
+
+    Parameters:
+    - filename (str): The file.
+
+    Returns:
+    tuple: (modification time in ns, size), or None if the file is missing.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def asset_digest(filename):
+    """
+    Hash a model file together with the .mtl files and textures it references.
+
+    The digest is memoised until any of these files changes, so long-lived
+    processes notice edited materials and textures too.
+
+    Parameters:
+    - filename (str): The path to an .obj or .mtl file.
+
+    Returns:
+    str: Hex SHA-256 digest.
+    """
+    path = os.path.abspath(filename)
+    memo = _asset_digests.get(path)
+    if memo is not None and all(_file_stamp(used) == stamp for used, stamp in memo[0]):
+        return memo[1]
+
+    used_files = [(path, _file_stamp(path))]
+    digest = hashlib.sha256()
+    dirname = os.path.dirname(path)
+    with open(path, 'rb') as file:
+        for line in file:
+            digest.update(line)
+            values = line.split()
+            if len(values) >= 2 and values[0] in (b'mtllib', b'map_Kd'):
+                referenced = os.path.join(dirname, values[1].decode())
+                if values[0] == b'mtllib':
+                    digest.update(asset_digest(referenced).encode())
+                    used_files.extend(_asset_digests[os.path.abspath(referenced)][0])
+                else:
+                    used_files.append((referenced, _file_stamp(referenced)))
+                    with open(referenced, 'rb') as texture:
+                        digest.update(hashlib.sha256(texture.read()).digest())
+    _asset_digests[path] = (used_files, digest.hexdigest())
+    return _asset_digests[path][1]
+
+
+def scene_digest(objects, settings):
+    """
+    Hash everything about a scene that affects its rendered frames, except the camera.
+
+    Parameters:
+    - objects (list): The OBJ objects of the scene.
+    - settings (dict): JSON-serialisable render settings: lighting, resolution,
+      anti-aliasing, encoder and so on.
+
+    Returns:
+    str: Hex SHA-256 digest.
+    """
+    scene = {
+        'version': CACHE_VERSION,
+        # Kolejność trójkątów decyduje o pikselach przy równej głębokości
+        'objects': [{'asset': asset_digest(obj.filename), 'swapyz': obj.swapyz, 'position': list(obj.position),
+                     'rotation': list(obj.rotation), 'reordered': bool(obj.mesh and obj.mesh['reordered'])}
+                    for obj in objects],
+        'settings': settings,
+    }
+    return hashlib.sha256(json.dumps(scene, sort_keys=True).encode()).hexdigest()
+
+
+def frame_key(scene, camera, field_of_view):
+    """
+    Build the cache key of one frame.
+
+    Parameters:
+    - scene (str): Digest from scene_digest.
+    - camera (Camera): The camera pose of the frame.
+    - field_of_view (float): The field of view of the projection the frame is rendered with.
+
+    Returns:
+    str: Hex SHA-256 digest.
+    """
+    # Zaokrąglenie, aby różnice na poziomie błędów zmiennoprzecinkowych nie psuły trafień
+    pose = [round(value, 6) + 0.0 for value in camera.view_matrix]
+    return hashlib.sha256(json.dumps([scene, pose, round(field_of_view, 6)]).encode()).hexdigest()
+
+
+class FrameCache:
+    """
+    Persistent content-addressed cache of rendered frame files.
+
+    Entries are files named after their frame_key, fanned out into subfolders. Hits
+    are hard-linked into the output folder (copied if linking is not possible). The
+    total size is kept under max_bytes by evicting the least recently used entries,
+    using the file modification time as the last-use time, so several processes can
+    share one cache folder.
+
+    Attributes:
+    - directory (str): The cache folder.
+    - max_bytes (int): Size cap of the cache.
+    - hits, misses, evictions (int): Statistics of this process.
+
+    Methods:
+    - fetch(self, key, target): Place a cached frame at target, if present.
+    - store(self, key, source): Add a rendered frame file to the cache.
+    - report(self): Print hit/miss statistics.
+    """
+
+    def __init__(self, directory=".frame_cache", max_bytes=2 * 1024 ** 3, extension=".jpg"):
+        """
+        Initializes a FrameCache object.
+
+        Parameters:
+        - directory (str): The cache folder. Created if missing.
+        - max_bytes (int): Size cap of the cache.
+        - extension (str): File extension of the cached frames.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_linked = 0
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + self.extension)
+
+    def _entries(self):
+        """
+        List the cached files.
+
+        Returns:
+        list: (path, last use time, size) tuples.
+        """
+        entries = []
+        for folder in os.scandir(self.directory):
+            if folder.is_dir():
+                for entry in os.scandir(folder.path):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def fetch(self, key, target):
+        """
+        Place a cached frame at target, if present.
+
+        Parameters:
+        - key (str): The frame key.
+        - target (str): The output file.
+
+        Returns:
+        bool: True on a hit.
+        """
+        path = self._path(key)
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            _link_or_copy(path, target)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        os.utime(path)
+        self.hits += 1
+        self.bytes_linked += os.path.getsize(path)
+        return True
+
+    def store(self, key, source):
+        """
+        Add a rendered frame file to the cache and evict old entries if needed.
+
+        Parameters:
+        - key (str): The frame key.
+        - source (str): The rendered file.
+
+        Returns:
+        None
+        """
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            _link_or_copy(source, path)
+        except FileExistsError:
+            # Inny proces zapisał tę samą klatkę
+            return
+        self.size += os.path.getsize(path)
+        if self.size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """
+        Remove least recently used entries until the cache is 10% under its cap.
+
+        Returns:
+        None
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self.size = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self.size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self.size -= size
+            self.evictions += 1
+
+    def report(self):
+        """
+        Print hit/miss statistics of this process.
+
+        Returns:
+        None
+        """
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        print(f"[frame cache] {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+              f"{self.evictions} evicted, {self.bytes_linked / 1024 ** 2:.1f} MiB reused, "
+              f"{self.size / 1024 ** 2:.1f} of {self.max_bytes / 1024 ** 2:.0f} MiB used")
+
+
+def _link_or_copy(source, target):
+    """
+    Hard-link source to target, copying if the file system does not allow it.
+
+    Parameters:
+    - source (str): The existing file.
+    - target (str): The new file.
+
+    Returns:
+    None
+    """
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        raise
+    except OSError:
+        if not os.path.exists(source):
+            raise FileNotFoundError(source)
+        shutil.copyfile(source, target)
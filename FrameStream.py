@@ -0,0 +1,182 @@
+from OpenGL.GL import *
+from collections import deque
+import ctypes
+
+import numpy as np
+
+from Camera import iter_trajectory
+from Framebuffer import Framebuffer
+from Profiler import profiler
+from main import DATASET_PROJECTION, VIEWPORT, camera_handle_input, camera_render_object, camera_setup_projection, \
+    init, load_cameras_from_json, load_objects_from_json
+
+
+def frame_metadata(camera, frame, objects):
+    """
+    Describe the camera pose and scene of a rendered frame.
+
+    Parameters:
+    - camera (Camera): The camera the frame was rendered with.
+    - frame (int): The frame number within the camera transition.
+    - objects (list): The rendered OBJ objects.
+
+    Returns:
+    dict: JSON-serialisable frame description.
+    """
+    return {
+        'camera_id': camera.id,
+        'frame': frame,
+        'position': list(camera.position),
+        'direction': list(camera.direction),
+        'up_vector': list(camera.up_vector),
+        'field_of_view': camera.field_of_view,
+        'view_matrix': list(camera.view_matrix),
+        'objects': [{'filename': obj.filename, 'position': list(obj.position), 'rotation': list(obj.rotation)}
+                    for obj in objects],
+    }
+
+
+def iter_frames(objects, cameras, framebuffer=None, prefetch=3, channels=3, samples=0, supersample=1):
+    """
+    Render the camera path once and yield the frames as NumPy arrays, without disk I/O.
+
+    Readbacks go through a ring of prefetch pixel buffer objects: frame N is
+    returned only after frame N + prefetch - 1 has been submitted, so the GPU keeps
+    rendering while the consumer works on earlier frames and at most prefetch frames
+    are in flight. The generator must be consumed on the thread owning the GL context.
+
+    Frames are framed like the dataset mode (DATASET_PROJECTION), but returned
+    upright, with the top row first. The dataset JPEGs keep the row order of
+    glReadPixels, bottom row first, so they are stored upside down; image[::-1]
+    turns a streamed frame into the same layout.
+
+    Parameters:
+    - objects (list): A list of objects to render.
+    - cameras (list): A list of Camera objects. They are modified in place.
+    - framebuffer (Framebuffer): Offscreen target to render into. By default a
+      window-sized one is created with samples and supersample, and freed when the
+      generator finishes or is closed.
+    - prefetch (int): Number of frames in flight.
+    - channels (int): 3 for RGB, 4 for RGBA.
+    - samples (int): MSAA samples per pixel of the default target.
+    - supersample (int): Supersampling factor of the default target, a power of two.
+
+    Yields:
+    tuple: (uint8 array of shape (H, W, channels) with the top row first, metadata dict).
+    """
+    owns_framebuffer = framebuffer is None
+    if owns_framebuffer:
+        framebuffer = Framebuffer(*VIEWPORT, samples=samples, supersample=supersample)
+    size = framebuffer.width * framebuffer.height * 4
+    pbos = [glGenBuffers(1) for _ in range(max(1, prefetch))]
+    for pbo in pbos:
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        glBufferData(GL_PIXEL_PACK_BUFFER, size, None, GL_STREAM_READ)
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    free_pbos = list(pbos)
+    in_flight = deque()
+    try:
+        framebuffer.bind()
+        camera_setup_projection(cameras[0], *DATASET_PROJECTION)
+        for camera, frame in iter_trajectory(cameras):
+            camera_handle_input(camera)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            with profiler.gpu_span("draw"):
+                for obj in objects:
+                    camera_render_object(obj, camera)
+            if not free_pbos:
+                pbo, metadata = in_flight.popleft()
+                yield _map_frame(pbo, metadata, framebuffer, channels)
+                free_pbos.append(pbo)
+            pbo = free_pbos.pop()
+            with profiler.span("readback"):
+                framebuffer.read_into_buffer(pbo)
+            in_flight.append((pbo, frame_metadata(camera, frame, objects)))
+            profiler.tick()
+        while in_flight:
+            yield _map_frame(*in_flight.popleft(), framebuffer, channels)
+    finally:
+        framebuffer.unbind()
+        glDeleteBuffers(len(pbos), pbos)
+        if owns_framebuffer:
+            framebuffer.free()
+
+
+def _map_frame(pbo, metadata, framebuffer, channels):
+    """
+    Copy a finished readback out of its pixel buffer object.
+
+    Parameters:
+    - pbo (int): The pixel buffer object.
+    - metadata (dict): The frame description.
+    - framebuffer (Framebuffer): The target the pixels were read from.
+    - channels (int): 3 for RGB, 4 for RGBA.
+
+    Returns:
+    tuple: (uint8 array of shape (H, W, channels), metadata dict).
+    """
+    with profiler.span("map"):
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        address = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        pixels = np.ctypeslib.as_array(
+            (ctypes.c_ubyte * (framebuffer.width * framebuffer.height * 4)).from_address(address))
+        # OpenGL zwraca wiersze od dołu - odwrócenie i kopia w jednym kroku
+        image = np.ascontiguousarray(pixels.reshape(framebuffer.height, framebuffer.width, 4)[::-1, :, :channels])
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+    return image, metadata
+
+
+def iter_batches(frames, batch_size, drop_last=False):
+    """
+    Group frames into batches.
+
+    Parameters:
+    - frames (iterable): (image, metadata) pairs as yielded by iter_frames.
+    - batch_size (int): Number of frames per batch.
+    - drop_last (bool): If True, a final incomplete batch is not yielded.
+
+    Yields:
+    tuple: (uint8 array of shape (B, H, W, C), list of B metadata dicts).
+    """
+    images, metadata = [], []
+    for image, meta in frames:
+        images.append(image)
+        metadata.append(meta)
+        if len(images) == batch_size:
+            yield np.stack(images), metadata
+            images, metadata = [], []
+    if images and not drop_last:
+        yield np.stack(images), metadata
+
+
+def open_frame_stream(objects_file="objects.json", cameras_file="cameras.json", batch_size=None, msaa=0,
+                      ssaa=1, prefetch=3, channels=3):
+    """
+    Open a window, load a scene and stream its dataset frames, e.g. for an online
+    training loop:
+
+        for images, metadata in open_frame_stream(batch_size=32):
+            train_step(images)
+
+    Parameters:
+    - objects_file (str): The JSON file describing the scene objects.
+    - cameras_file (str): The JSON file describing the camera path.
+    - batch_size (int): If given, yield (B, H, W, C) batches instead of single frames.
+    - msaa (int): MSAA samples per pixel.
+    - ssaa (int): Supersampling factor, a power of two.
+    - prefetch (int): Number of frames in flight.
+    - channels (int): 3 for RGB, 4 for RGBA.
+
+    Returns:
+    iterator: Frames as yielded by iter_frames, or batches as yielded by iter_batches.
+    """
+    init()
+    objects = load_objects_from_json(objects_file)
+    cameras = load_cameras_from_json(cameras_file)
+    frames = iter_frames(objects, cameras, prefetch=prefetch, channels=channels, samples=msaa, supersample=ssaa)
+    if batch_size is None:
+        return frames
+    return iter_batches(frames, batch_size)
+
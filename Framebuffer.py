@@ -0,0 +1,171 @@
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION.GL_1_0 import glReadPixels as glReadPixelsRaw
+import ctypes
+
+
+class Framebuffer:
+    """
+    Offscreen render target with optional multisampling and supersampling.
+
+    The scene is drawn into a (possibly multisampled) framebuffer object at
+    supersample times the output size. resolve() downsamples it on the GPU with
+    glBlitFramebuffer, halving the size per blit so every step is a 2x2 box filter,
+    and glReadPixels then reads only output-sized pixels.
+
+    Attributes:
+    - width, height (int): The output size in pixels.
+    - samples (int): MSAA samples per pixel (0 or 1 disables multisampling).
+    - supersample (int): Render size factor; a power of two, 1 disables supersampling.
+    - render_width, render_height (int): The size the scene is drawn at.
+
+    Methods:
+    - bind(self): Draw into this target and set the viewport.
+    - resolve(self): Downsample to the output size on the GPU.
+    - read_pixels(self): Resolve and read back RGBA pixels.
+    - read_into_buffer(self, pbo): Resolve and start an asynchronous readback.
+    - unbind(self): Draw into the window again.
+    - free(self): Delete the GL objects.
+    """
+
+    def __init__(self, width, height, samples=0, supersample=1):
+        """
+        Initializes a Framebuffer object. Requires a current GL context with
+        framebuffer object support (GL 3.0 or ARB_framebuffer_object).
+
+        Parameters:
+        - width (int): The output width in pixels.
+        - height (int): The output height in pixels.
+        - samples (int): MSAA samples per pixel, clamped to GL_MAX_SAMPLES.
+        - supersample (int): Render size factor, a power of two.
+        """
+        if supersample < 1 or supersample & (supersample - 1):
+            raise ValueError("supersample must be a power of two")
+        self.width = width
+        self.height = height
+        self.samples = min(samples, glGetIntegerv(GL_MAX_SAMPLES)) if samples > 1 else 0
+        self.supersample = supersample
+        self.render_width = width * supersample
+        self.render_height = height * supersample
+        self.renderbuffers = []
+
+        # Docelowy bufor renderowania sceny (z głębią)
+        self.render_fbo = self._create_fbo(self.render_width, self.render_height, self.samples, depth=True)
+
+        # Łańcuch buforów do rozwiązania MSAA i zmniejszania obrazu o połowę
+        self.chain = []
+        width, height = self.render_width, self.render_height
+        if self.samples:
+            self.chain.append((self._create_fbo(width, height, 0), width, height))
+        while width > self.width:
+            width, height = width // 2, height // 2
+            self.chain.append((self._create_fbo(width, height, 0), width, height))
+
+    def _create_fbo(self, width, height, samples, depth=False):
+        """
+        Create a framebuffer object with a color and optionally a depth renderbuffer.
+
+        Parameters:
+        - width (int): The width in pixels.
+        - height (int): The height in pixels.
+        - samples (int): MSAA samples per pixel, 0 for a single-sampled buffer.
+        - depth (bool): If True, attach a depth renderbuffer.
+
+        Returns:
+        int: OpenGL framebuffer ID.
+        """
+        fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        attachments = [(GL_RGBA8, GL_COLOR_ATTACHMENT0)]
+        if depth:
+            attachments.append((GL_DEPTH_COMPONENT24, GL_DEPTH_ATTACHMENT))
+        for internal_format, attachment in attachments:
+            rbo = glGenRenderbuffers(1)
+            glBindRenderbuffer(GL_RENDERBUFFER, rbo)
+            if samples:
+                glRenderbufferStorageMultisample(GL_RENDERBUFFER, samples, internal_format, width, height)
+            else:
+                glRenderbufferStorage(GL_RENDERBUFFER, internal_format, width, height)
+            glFramebufferRenderbuffer(GL_FRAMEBUFFER, attachment, GL_RENDERBUFFER, rbo)
+            self.renderbuffers.append(rbo)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f"framebuffer {width}x{height} ({samples} samples) is incomplete: {status}")
+        return fbo
+
+    def bind(self):
+        """
+        Draw into this target and set the viewport to its render size.
+
+        Returns:
+        None
+        """
+        glBindFramebuffer(GL_FRAMEBUFFER, self.render_fbo)
+        glViewport(0, 0, self.render_width, self.render_height)
+
+    def resolve(self):
+        """
+        Resolve multisampling and downsample to the output size on the GPU.
+
+        Returns:
+        int: The framebuffer ID holding the output-sized image.
+        """
+        source, width, height = self.render_fbo, self.render_width, self.render_height
+        for target, target_width, target_height in self.chain:
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, source)
+            glBindFramebuffer(GL_DRAW_FRAMEBUFFER, target)
+            glBlitFramebuffer(0, 0, width, height, 0, 0, target_width, target_height, GL_COLOR_BUFFER_BIT,
+                              GL_NEAREST if target_width == width else GL_LINEAR)
+            source, width, height = target, target_width, target_height
+        glBindFramebuffer(GL_FRAMEBUFFER, self.render_fbo)
+        return source
+
+    def read_pixels(self):
+        """
+        Resolve and read back the output image.
+
+        Returns:
+        bytes: RGBA pixels, bottom row first.
+        """
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.resolve())
+        pixels = glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.render_fbo)
+        return pixels
+
+    def read_into_buffer(self, pbo):
+        """
+        Resolve and start an asynchronous readback into a pixel buffer object.
+        The pixels can be mapped from the buffer later without stalling the GPU now.
+
+        Parameters:
+        - pbo (int): A GL_PIXEL_PACK_BUFFER of at least width * height * 4 bytes.
+
+        Returns:
+        None
+        """
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.resolve())
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        # Surowa funkcja przyjmuje przesunięcie w buforze zamiast tablicy wynikowej
+        glReadPixelsRaw(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.render_fbo)
+
+    def unbind(self):
+        """
+        Draw into the window again.
+
+        Returns:
+        None
+        """
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def free(self):
+        """
+        Delete the framebuffer and renderbuffer objects.
+
+        Returns:
+        None
+        """
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glDeleteFramebuffers(1 + len(self.chain), [self.render_fbo] + [fbo for fbo, _, _ in self.chain])
+        glDeleteRenderbuffers(len(self.renderbuffers), self.renderbuffers)
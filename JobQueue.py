@@ -0,0 +1,215 @@
+from datetime import datetime
+import json
+import os
+import platform
+import traceback
+
+# Podkatalogi kolejki zadań
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def load_job_spec(json_filename):
+    """
+    Load a job spec file.
+
+    The file holds either a list of jobs or an object with a "jobs" list. Each job
+    names a scene ("objects"), a camera path ("cameras") and an output folder
+    ("output"), e.g. {"objects": "objects.json", "cameras": "cameras.json",
+    "output": "renders/scene1"}. Relative paths are resolved against the folder of
+    the spec file, so queued jobs do not depend on the directory a worker runs in.
+
+    Parameters:
+    - json_filename (str): The filename of the job spec.
+
+    Returns:
+    list: A list of job dictionaries with absolute paths.
+    """
+    with open(json_filename, 'r') as file:
+        spec = json.load(file)
+
+    jobs = spec["jobs"] if isinstance(spec, dict) else spec
+    base_dir = os.path.dirname(os.path.abspath(json_filename))
+    for i, job in enumerate(jobs):
+        for key in ("objects", "cameras", "output"):
+            if key not in job:
+                raise ValueError(f"job {i} in {json_filename} has no '{key}' entry")
+            job[key] = os.path.join(base_dir, job[key])
+    return jobs
+
+
+def local_worker_id():
+    """
+    Identify the current process as a queue worker.
+
+    Returns:
+    str: "<host name>-<process id>".
+    """
+    return f"{platform.node()}-{os.getpid()}"
+
+
+def init_queue(queue_dir):
+    """
+    Create the subfolders of a job queue directory.
+
+    Parameters:
+    - queue_dir (str): The queue directory.
+
+    Returns:
+    None
+    """
+    for state in (PENDING, RUNNING, DONE, FAILED):
+        os.makedirs(os.path.join(queue_dir, state), exist_ok=True)
+
+
+def enqueue_jobs(jobs, queue_dir):
+    """
+    Add jobs to a queue directory, one file per job.
+
+    Parameters:
+    - jobs (list): Job dictionaries as returned by load_job_spec.
+    - queue_dir (str): The queue directory.
+
+    Returns:
+    list: Paths of the created job files.
+    """
+    init_queue(queue_dir)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    paths = []
+    for i, job in enumerate(jobs):
+        path = os.path.join(queue_dir, PENDING, f"{stamp}_{i:05d}.json")
+        # Write to a temporary name first, so workers never see a half-written job
+        with open(path + ".tmp", 'w') as file:
+            json.dump(job, file, indent=4)
+        os.replace(path + ".tmp", path)
+        paths.append(path)
+    return paths
+
+
+def claim_job(queue_dir, worker_id=None):
+    """
+    Take the oldest pending job from a queue directory.
+
+    Jobs are claimed by renaming them into the running folder, which is atomic, so
+    several workers can pull from the same queue without locking.
+
+    Parameters:
+    - queue_dir (str): The queue directory.
+    - worker_id (str): Identifier of the claiming worker, stored in the file name.
+      Defaults to local_worker_id().
+
+    Returns:
+    tuple: (path of the claimed job file, job dictionary), or None if no job is pending.
+    """
+    if worker_id is None:
+        worker_id = local_worker_id()
+    pending_dir = os.path.join(queue_dir, PENDING)
+    for name in sorted(os.listdir(pending_dir)):
+        if not name.endswith(".json"):
+            continue
+        claimed = os.path.join(queue_dir, RUNNING, f"{worker_id}__{name}")
+        try:
+            os.rename(os.path.join(pending_dir, name), claimed)
+        except FileNotFoundError:
+            # Another worker was faster
+            continue
+        with open(claimed, 'r') as file:
+            return claimed, json.load(file)
+    return None
+
+
+def finish_job(queue_dir, claimed, error=None):
+    """
+    Move a claimed job to the done or failed folder.
+
+    Parameters:
+    - queue_dir (str): The queue directory.
+    - claimed (str): Path returned by claim_job.
+    - error (BaseException): The exception that made the job fail, or None on success.
+
+    Returns:
+    str: The new path of the job file.
+    """
+    name = os.path.basename(claimed)
+    if error is None:
+        target = os.path.join(queue_dir, DONE, name)
+    else:
+        target = os.path.join(queue_dir, FAILED, name)
+        with open(target + ".error.txt", 'w') as file:
+            file.write("".join(traceback.format_exception(type(error), error, error.__traceback__)))
+    os.replace(claimed, target)
+    return target
+
+
+def release_job(queue_dir, claimed):
+    """
+    Put a claimed job back into the pending folder, under its original name.
+
+    Parameters:
+    - queue_dir (str): The queue directory.
+    - claimed (str): Path returned by claim_job.
+
+    Returns:
+    str: The new path of the job file.
+    """
+    name = os.path.basename(claimed).split("__", 1)[-1]
+    target = os.path.join(queue_dir, PENDING, name)
+    os.replace(claimed, target)
+    return target
+
+
+def requeue_stale_jobs(queue_dir):
+    """
+    Release the running jobs of workers on this host that no longer exist.
+
+    Claims of workers on other hosts sharing the queue cannot be checked and are
+    left alone.
+
+    Parameters:
+    - queue_dir (str): The queue directory.
+
+    Returns:
+    list: Paths of the released job files.
+    """
+    released = []
+    running_dir = os.path.join(queue_dir, RUNNING)
+    for name in sorted(os.listdir(running_dir)):
+        worker_id, separator, _ = name.partition("__")
+        host, _, pid = worker_id.rpartition("-")
+        if not separator or host != platform.node() or not pid.isdigit() or _process_exists(int(pid)):
+            continue
+        try:
+            released.append(release_job(queue_dir, os.path.join(running_dir, name)))
+        except FileNotFoundError:
+            # Inny worker zwolnił to zadanie wcześniej
+            continue
+    return released
+
+
+def _process_exists(pid):
+    """
+    Check whether a process with the given id is running on this host.
+
+    Parameters:
+    - pid (int): The process id.
+
+    Returns:
+    bool: False only if the process is known to be gone.
+    """
+    if os.name == "nt":
+        # os.kill na Windows zabija proces zamiast go sprawdzać
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # Zabity proces, którego rodzic jeszcze nie odebrał (zombie), też już nie pracuje
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as file:
+            return file.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
@@ -0,0 +1,245 @@
+from array import array
+import os
+import sys
+
+# Rozmiar symulowanej pamięci podręcznej wierzchołków po transformacji (FIFO)
+VERTEX_CACHE_SIZE = 16
+
+
+def weld(parsed):
+    """
+    Triangulate the faces of a parsed OBJ and merge identical (v, vt, vn) corners.
+
+    Triangles are grouped by material, keeping the file order inside each group.
+
+    Parameters:
+    - parsed (dict): Result of ObjParser.parse_obj.
+
+    Returns:
+    tuple: (list of unique (v, vt, vn) index triples, array of triangle indices into
+    that list, list of (material, first index, index count) groups).
+    """
+    keys = []
+    lookup = {}
+    by_material = {}
+    for vertices, normals, texcoords, material in parsed['faces']:
+        corners = []
+        for corner in zip(vertices, texcoords, normals):
+            index = lookup.get(corner)
+            if index is None:
+                index = lookup[corner] = len(keys)
+                keys.append(corner)
+            corners.append(index)
+        triangles = by_material.setdefault(material, array('I'))
+        # Wielokąty wypukłe dzielone na wachlarz trójkątów, jak GL_POLYGON
+        for i in range(1, len(corners) - 1):
+            triangles.extend((corners[0], corners[i], corners[i + 1]))
+
+    indices = array('I')
+    groups = []
+    for material, triangles in by_material.items():
+        groups.append((material, len(indices), len(triangles)))
+        indices.extend(triangles)
+    return keys, indices, groups
+
+
+def acmr(indices, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Compute the average cache miss ratio of an index list with a FIFO vertex cache.
+
+    Parameters:
+    - indices (array): Triangle indices.
+    - cache_size (int): Number of vertices the cache holds.
+
+    Returns:
+    float: Vertex transforms per triangle; 3.0 means no reuse at all.
+    """
+    if not indices:
+        return 0.0
+    # Dla każdego wierzchołka - numer chybienia, przy którym trafił do pamięci; wypada
+    # z niej, gdy po nim trafiło tam cache_size innych wierzchołków
+    inserted = {}
+    misses = 0
+    for index in indices:
+        time = inserted.get(index)
+        if time is None or misses - time > cache_size:
+            inserted[index] = misses
+            misses += 1
+    return misses / (len(indices) / 3)
+
+
+def tipsify(indices, vertex_count, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Reorder triangles for post-transform vertex cache locality.
+
+    Implements Tipsify (Sander, Nehab and Barczak, "Fast Triangle Reordering for
+    Vertex Locality and Reduced Overdraw", 2007): triangles are emitted as fans
+    around a vertex, picking the next fanning vertex that is still in the cache.
+
+    Parameters:
+    - indices (array): Triangle indices.
+    - vertex_count (int): Number of vertices the indices refer to.
+    - cache_size (int): Number of vertices the cache holds.
+
+    Returns:
+    array: The reordered triangle indices.
+    """
+    triangle_count = len(indices) // 3
+    live = [0] * vertex_count
+    adjacency = [[] for _ in range(vertex_count)]
+    for triangle in range(triangle_count):
+        for index in indices[3 * triangle:3 * triangle + 3]:
+            live[index] += 1
+            adjacency[index].append(triangle)
+
+    cache_time = [0] * vertex_count
+    emitted = [False] * triangle_count
+    dead_end = []
+    output = array('I')
+    timestamp = cache_size + 1
+    cursor = 0
+    fanning = indices[0] if triangle_count else -1
+
+    while fanning >= 0:
+        candidates = []
+        for triangle in adjacency[fanning]:
+            if emitted[triangle]:
+                continue
+            emitted[triangle] = True
+            for index in indices[3 * triangle:3 * triangle + 3]:
+                output.append(index)
+                dead_end.append(index)
+                candidates.append(index)
+                live[index] -= 1
+                if timestamp - cache_time[index] > cache_size:
+                    cache_time[index] = timestamp
+                    timestamp += 1
+
+        # Następny wierzchołek: wciąż w pamięci po wyemitowaniu wszystkich jego trójkątów
+        fanning = -1
+        best_priority = -1
+        for index in candidates:
+            if live[index] > 0:
+                priority = 0
+                if timestamp - cache_time[index] + 2 * live[index] <= cache_size:
+                    priority = timestamp - cache_time[index]
+                if priority > best_priority:
+                    best_priority = priority
+                    fanning = index
+
+        if fanning < 0:
+            while dead_end:
+                index = dead_end.pop()
+                if live[index] > 0:
+                    fanning = index
+                    break
+        if fanning < 0:
+            while cursor < vertex_count:
+                if live[cursor] > 0:
+                    fanning = cursor
+                    break
+                cursor += 1
+    return output
+
+
+def reorder_vertices(keys, indices):
+    """
+    Renumber vertices in order of first use, for vertex fetch locality.
+
+    Parameters:
+    - keys (list): Per-vertex data.
+    - indices (array): Triangle indices into keys.
+
+    Returns:
+    tuple: (reordered keys, remapped indices). Unused vertices are dropped.
+    """
+    remap = {}
+    new_keys = []
+    new_indices = array('I')
+    for index in indices:
+        new_index = remap.get(index)
+        if new_index is None:
+            new_index = remap[index] = len(new_keys)
+            new_keys.append(keys[index])
+        new_indices.append(new_index)
+    return new_keys, new_indices
+
+
+def optimize_mesh(parsed, cache_size=VERTEX_CACHE_SIZE, reorder=False):
+    """
+    Build an indexed triangle mesh from a parsed OBJ.
+
+    Corners are welded into unique vertices. With reorder, the triangles of every
+    material group are also reordered with Tipsify and vertices are renumbered in
+    order of first use. Tipsify roughly doubles the cost of a parse in pure Python,
+    so it is opt-in.
+
+    Parameters:
+    - parsed (dict): Result of ObjParser.parse_obj.
+    - cache_size (int): Vertex cache size to optimise for.
+    - reorder (bool): If True, reorder the triangles for the vertex cache.
+
+    Returns:
+    dict: 'vertex_data' (array of floats, 8 per vertex: position, normal, texcoord),
+    'indices' (array), 'groups' (list of (material, first index, index count)),
+    'has_normals', 'has_texcoords', 'reordered' (bool), 'corners' (int), 'acmr_before'
+    and 'acmr_after' (float, for the welded mesh in file order and after optimisation;
+    None without reorder).
+    """
+    keys, indices, groups = weld(parsed)
+    acmr_before = acmr_after = None
+    optimized = indices
+    if reorder:
+        acmr_before = acmr(indices, cache_size)
+        optimized = array('I')
+        for material, start, count in groups:
+            optimized.extend(tipsify(indices[start:start + count], len(keys), cache_size))
+        keys, optimized = reorder_vertices(keys, optimized)
+        acmr_after = acmr(optimized, cache_size)
+
+    positions, normals, texcoords = parsed['vertices'], parsed['normals'], parsed['texcoords']
+    has_normals = any(normal > 0 for _, _, normal in keys)
+    has_texcoords = any(texcoord > 0 for _, texcoord, _ in keys)
+    vertex_data = array('f')
+    for vertex, texcoord, normal in keys:
+        vertex_data.extend(positions[3 * (vertex - 1):3 * vertex])
+        vertex_data.extend(normals[3 * (normal - 1):3 * normal] if normal > 0 else (0.0, 0.0, 0.0))
+        vertex_data.extend(texcoords[2 * (texcoord - 1):2 * texcoord] if texcoord > 0 else (0.0, 0.0))
+
+    return {
+        'vertex_data': vertex_data,
+        'indices': optimized,
+        'groups': groups,
+        'has_normals': has_normals,
+        'has_texcoords': has_texcoords,
+        'reordered': reorder,
+        'corners': len(indices),
+        'acmr_before': acmr_before,
+        'acmr_after': acmr_after,
+    }
+
+
+def report_models(directory="models", cache_size=VERTEX_CACHE_SIZE):
+    """
+    Print vertex counts and ACMR before and after optimisation for every OBJ file.
+
+    Parameters:
+    - directory (str): The folder with the .obj files.
+    - cache_size (int): Vertex cache size to simulate.
+
+    Returns:
+    None
+    """
+    from ObjParser import parse_obj
+
+    print(f"{'model':<18} {'triangles':>9} {'corners':>8} {'vertices':>8} {'ACMR file':>9} {'ACMR opt':>8}")
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(".obj"):
+            continue
+        mesh = parse_obj(os.path.join(directory, name), textures=False, reorder=True)['mesh']
+        print(f"{name:<18} {mesh['corners'] // 3:>9} {mesh['corners']:>8} {len(mesh['vertex_data']) // 8:>8} "
+              f"{mesh['acmr_before']:>9.3f} {mesh['acmr_after']:>8.3f}")
+
+
+if __name__ == "__main__":
+    report_models(*sys.argv[1:2])
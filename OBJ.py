@@ -1,6 +1,6 @@
-import pygame
 from OpenGL.GL import *
-import os
+from ObjParser import decode_texture, parse_material, parse_obj
+import ctypes
 
 PHONG_AMBIENT = (0.2, 0.2, 0.2, 1.0)
 PHONG_DIFFUSE = (0.8, 0.8, 0.8, 1.0)
@@ -14,17 +14,26 @@ class OBJ:
 
     Attributes:
     - generate_on_init (bool): If True, generate OpenGL display list on object initialization.
+    - use_index_buffers (bool): If True, draw the welded indexed mesh from buffer
+      objects instead of the display list, when the parsed data has one.
     - PHONG_AMBIENT, PHONG_DIFFUSE, PHONG_SPECULAR, PHONG_SHININESS (tuple): Phong shading parameters.
 
     Methods:
     - load_texture(cls, image_file): Load texture from an image file.
+    - upload_texture(cls, image, size): Upload decoded pixels to an OpenGL texture.
     - load_material(cls, filename): Load materials from an .mtl file.
-    - __init__(self, filename, swapyz=False, position=None, rotation=None): Constructor for OBJ class.
+    - upload_materials(cls, contents): Upload the textures of parsed materials.
+    - upload_mesh(cls, mesh): Upload an optimised mesh to buffer objects.
+    - free_parsed(cls, parsed): Free the buffers and textures uploaded for parsed data.
+    - __init__(self, filename, swapyz=False, position=None, rotation=None, parsed=None): Constructor for OBJ class.
     - generate(self): Generate OpenGL display list for rendering.
+    - apply_material(self, material): Set the texture, color and Phong parameters of a material.
     - render(self): Render the object in the scene.
+    - draw_elements(self): Draw the optimised mesh from buffer objects.
     - free(self): Free resources associated with the object.
     """
     generate_on_init = True
+    use_index_buffers = True
 
     # Metoda do wczytywania tekstur z pliku obrazu
     @classmethod
@@ -38,9 +47,22 @@ class OBJ:
         Returns:
         int: OpenGL texture ID.
         """
-        surf = pygame.image.load(image_file)
-        image = pygame.image.tostring(surf, 'RGBA', 1)
-        ix, iy = surf.get_rect().size
+        return cls.upload_texture(*decode_texture(image_file))
+
+    # Metoda do przesyłania zdekodowanej tekstury do OpenGL
+    @classmethod
+    def upload_texture(cls, image, size):
+        """
+        Upload decoded RGBA pixels to a new OpenGL texture.
+
+        Parameters:
+        - image (bytes): Raw RGBA pixel data, bottom row first.
+        - size (tuple): The (width, height) of the image.
+
+        Returns:
+        int: OpenGL texture ID.
+        """
+        ix, iy = size
         texid = glGenTextures(1)
         glBindTexture(GL_TEXTURE_2D, texid)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -60,28 +82,76 @@ class OBJ:
         Returns:
         dict: Dictionary of material properties.
         """
-        contents = {}
-        mtl = None
-        dirname = os.path.dirname(filename)
-
-        for line in open(filename, "r"):
-            if line.startswith('#'): continue
-            values = line.split()
-            if not values: continue
-            if values[0] == 'newmtl':
-                mtl = contents[values[1]] = {}
-            elif mtl is None:
-                raise ValueError("mtl file doesn't start with newmtl stmt")
-            elif values[0] == 'map_Kd':
-                mtl[values[0]] = values[1]
-                imagefile = os.path.join(dirname, mtl['map_Kd'])
-                mtl['texture_Kd'] = cls.load_texture(imagefile)
-            else:
-                mtl[values[0]] = list(map(float, values[1:]))
+        return cls.upload_materials(parse_material(filename))
+
+    # Metoda do przesyłania tekstur materiałów do OpenGL
+    @classmethod
+    def upload_materials(cls, contents):
+        """
+        Upload the decoded textures of parsed materials to OpenGL.
+
+        Materials that already hold a texture ID are left untouched, so the same
+        parsed materials can be shared by several objects.
+
+        Parameters:
+        - contents (dict): Materials as returned by parse_material.
+
+        Returns:
+        dict: The same dictionary, with 'texture_Kd' set for textured materials.
+        """
+        for mtl in contents.values():
+            if 'image_Kd' in mtl and 'texture_Kd' not in mtl:
+                mtl['texture_Kd'] = cls.upload_texture(*mtl.pop('image_Kd'))
         return contents
 
+    # Metoda do przesyłania zoptymalizowanej siatki do buforów OpenGL
+    @classmethod
+    def upload_mesh(cls, mesh):
+        """
+        Upload the vertex and index data of an optimised mesh to buffer objects.
+
+        A mesh that already holds buffer IDs is left untouched, so the same parsed
+        mesh can be shared by several objects.
+
+        Parameters:
+        - mesh (dict): Mesh as returned by MeshOptimizer.optimize_mesh.
+
+        Returns:
+        dict: The same dictionary, with 'vbo' and 'ibo' set.
+        """
+        if 'vbo' not in mesh:
+            mesh['vbo'], mesh['ibo'] = glGenBuffers(2)
+            glBindBuffer(GL_ARRAY_BUFFER, mesh['vbo'])
+            glBufferData(GL_ARRAY_BUFFER, mesh['vertex_data'].tobytes(), GL_STATIC_DRAW)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, mesh['ibo'])
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, mesh['indices'].tobytes(), GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        return mesh
+
+    # Metoda do zwolnienia buforów i tekstur współdzielonych przez dane z parse_obj
+    @classmethod
+    def free_parsed(cls, parsed):
+        """
+        Free the buffer objects and textures uploaded for parsed data.
+
+        Objects created from the parsed data must not be rendered afterwards.
+
+        Parameters:
+        - parsed (dict): Result of parse_obj, as passed to the constructor.
+
+        Returns:
+        None
+        """
+        mesh = parsed.get('mesh')
+        if mesh is not None and 'vbo' in mesh:
+            glDeleteBuffers(2, [mesh.pop('vbo'), mesh.pop('ibo')])
+        for mtl in (parsed['mtl'] or {}).values():
+            if 'texture_Kd' in mtl:
+                glDeleteTextures([mtl.pop('texture_Kd')])
+
     # Konstruktor klasy OBJ
-    def __init__(self, filename, swapyz=False, position=None, rotation=None):
+    def __init__(self, filename, swapyz=False, position=None, rotation=None, parsed=None):
         """Loads a Wavefront OBJ file. """
         """
         Constructor for the OBJ class.
@@ -91,51 +161,21 @@ class OBJ:
         - swapyz (bool): If True, swap Y and Z coordinates.
         - position (list): The initial position of the object.
         - rotation (list): The initial rotation of the object.
+        - parsed (dict): Result of parse_obj for this file. If None, the file is parsed here.
         """
-        self.vertices = []
-        self.normals = []
-        self.texcoords = []
-        self.faces = []
+        if parsed is None:
+            parsed = parse_obj(filename, swapyz)
+
+        self.filename = filename
+        self.swapyz = swapyz
+        self.vertices = _rows(parsed['vertices'], 3)
+        self.normals = _rows(parsed['normals'], 3)
+        self.texcoords = _rows(parsed['texcoords'], 2)
+        self.faces = parsed['faces']
+        self.mesh = parsed.get('mesh') if self.use_index_buffers else None
         self.gl_list = 0
-        dirname = os.path.dirname(filename)
-
-        material = None
-        for line in open(filename, "r"):
-            if line.startswith('#'): continue
-            values = line.split()
-            if not values: continue
-            if values[0] == 'v':
-                v = list(map(float, values[1:4]))
-                if swapyz:
-                    v = v[0], v[2], v[1]
-                self.vertices.append(v)
-            elif values[0] == 'vn':
-                v = list(map(float, values[1:4]))
-                if swapyz:
-                    v = v[0], v[2], v[1]
-                self.normals.append(v)
-            elif values[0] == 'vt':
-                self.texcoords.append(list(map(float, values[1:3])))
-            elif values[0] in ('usemtl', 'usemat'):
-                material = values[1]
-            elif values[0] == 'mtllib':
-                self.mtl = self.load_material(os.path.join(dirname, values[1]))
-            elif values[0] == 'f':
-                face = []
-                texcoords = []
-                norms = []
-                for v in values[1:]:
-                    w = v.split('/')
-                    face.append(int(w[0]))
-                    if len(w) >= 2 and len(w[1]) > 0:
-                        texcoords.append(int(w[1]))
-                    else:
-                        texcoords.append(0)
-                    if len(w) >= 3 and len(w[2]) > 0:
-                        norms.append(int(w[2]))
-                    else:
-                        norms.append(0)
-                self.faces.append((face, norms, texcoords, material))
+        if parsed['mtl'] is not None:
+            self.mtl = self.upload_materials(parsed['mtl'])
 
         self.position = position or [0, 0, 0]
         self.rotation = rotation or [0, 0, 0]
@@ -146,11 +186,16 @@ class OBJ:
     # Metoda do generowania listy wyświetlania obiektu w OpenGL
     def generate(self):
         """
-        Generate OpenGL display list for rendering.
+        Generate OpenGL display list for rendering, or upload the optimised mesh
+        to buffer objects if it is used instead.
 
         Returns:
         None
         """
+        if self.mesh is not None:
+            self.upload_mesh(self.mesh)
+            return
+
         self.gl_list = glGenLists(1)
         glNewList(self.gl_list, GL_COMPILE)
         glEnable(GL_TEXTURE_2D)
@@ -162,16 +207,7 @@ class OBJ:
         for face in self.faces:
             vertices, normals, texture_coords, material = face
 
-            mtl = self.mtl[material]
-            if 'texture_Kd' in mtl:
-                glBindTexture(GL_TEXTURE_2D, mtl['texture_Kd'])
-            else:
-                glColor(*mtl['Kd'])
-
-            glMaterialfv(GL_FRONT_AND_BACK, GL_AMBIENT, mtl['Ka'])
-            glMaterialfv(GL_FRONT_AND_BACK, GL_DIFFUSE, mtl['Kd'])
-            glMaterialfv(GL_FRONT_AND_BACK, GL_SPECULAR, PHONG_SPECULAR)
-            glMaterialfv(GL_FRONT_AND_BACK, GL_SHININESS, PHONG_SHININESS)
+            self.apply_material(material)
 
             glBegin(GL_POLYGON)
             for i in range(len(vertices)):
@@ -186,6 +222,28 @@ class OBJ:
         glDisable(GL_TEXTURE_2D)
         glEndList()
 
+    # Metoda ustawiająca materiał (teksturę, kolor i parametry Phonga)
+    def apply_material(self, material):
+        """
+        Set the texture, color and Phong parameters of a material.
+
+        Parameters:
+        - material (str): The material name.
+
+        Returns:
+        None
+        """
+        mtl = self.mtl[material]
+        if 'texture_Kd' in mtl:
+            glBindTexture(GL_TEXTURE_2D, mtl['texture_Kd'])
+        else:
+            glColor(*mtl['Kd'])
+
+        glMaterialfv(GL_FRONT_AND_BACK, GL_AMBIENT, mtl['Ka'])
+        glMaterialfv(GL_FRONT_AND_BACK, GL_DIFFUSE, mtl['Kd'])
+        glMaterialfv(GL_FRONT_AND_BACK, GL_SPECULAR, PHONG_SPECULAR)
+        glMaterialfv(GL_FRONT_AND_BACK, GL_SHININESS, PHONG_SHININESS)
+
     # Metoda do renderowania obiektu w scenie
     def render(self):
         """
@@ -195,15 +253,71 @@ class OBJ:
         None
         """
         glEnable(GL_TEXTURE_2D)
-        glCallList(self.gl_list)
+        if self.mesh is not None:
+            self.draw_elements()
+        else:
+            glCallList(self.gl_list)
         glDisable(GL_TEXTURE_2D)
 
+    # Metoda rysująca zoptymalizowaną siatkę z buforów wierzchołków i indeksów
+    def draw_elements(self):
+        """
+        Draw the optimised mesh with one glDrawElements call per material.
+
+        Returns:
+        None
+        """
+        mesh = self.mesh
+        stride = 8 * 4  # pozycja, normalna i współrzędne tekstury jako float
+        glFrontFace(GL_CCW)
+        glPushMatrix()
+        glTranslatef(*self.position)
+
+        glBindBuffer(GL_ARRAY_BUFFER, mesh['vbo'])
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, mesh['ibo'])
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, stride, ctypes.c_void_p(0))
+        if mesh['has_normals']:
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glNormalPointer(GL_FLOAT, stride, ctypes.c_void_p(12))
+        if mesh['has_texcoords']:
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glTexCoordPointer(2, GL_FLOAT, stride, ctypes.c_void_p(24))
+
+        for material, start, count in mesh['groups']:
+            self.apply_material(material)
+            glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(start * 4))
+
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glPopMatrix()
+
     # Metoda do zwolnienia zasobów związanych z obiektem
     def free(self):
         """
-        Free resources associated with the object.
+        Free resources associated with the object. Buffers and textures shared
+        through the parsed data are kept; see free_parsed.
 
         Returns:
         None
         """
-        glDeleteLists([self.gl_list])
+        if self.gl_list:
+            glDeleteLists(self.gl_list, 1)
+            self.gl_list = 0
+
+
+def _rows(values, width):
+    """
+    Split a flat array into a list of fixed-width tuples.
+
+    Parameters:
+    - values (array): The flat array.
+    - width (int): The number of components per row.
+
+    Returns:
+    list: The rows as tuples.
+    """
+    return list(zip(*[iter(values)] * width))
@@ -0,0 +1,145 @@
+# Parsowanie plików OBJ/MTL bez OpenGL - moduł jest lekki, więc procesy robocze
+# importują tylko jego, a pygame dopiero przy pierwszej teksturze
+from array import array
+import os
+import time
+
+from MeshOptimizer import optimize_mesh
+
+
+def decode_texture(image_file):
+    """
+    Decode an image file to raw RGBA pixels without touching OpenGL.
+
+    Parameters:
+    - image_file (str): The path to the image file.
+
+    Returns:
+    tuple: (bytes, (width, height)) with rows stored bottom row first.
+    """
+    import pygame.image
+
+    surf = pygame.image.load(image_file)
+    return pygame.image.tostring(surf, 'RGBA', 1), surf.get_rect().size
+
+
+def parse_material(filename, textures=True):
+    """
+    Parse an .mtl file, decoding its textures but not uploading them.
+
+    Parameters:
+    - filename (str): The path to the .mtl file.
+    - textures (bool): If False, texture images are not decoded.
+
+    Returns:
+    dict: Dictionary of material properties. Textured materials hold the decoded
+    image under 'image_Kd' until OBJ.upload_materials is called.
+    """
+    contents = {}
+    mtl = None
+    dirname = os.path.dirname(filename)
+
+    for line in open(filename, "r"):
+        if line.startswith('#'): continue
+        values = line.split()
+        if not values: continue
+        if values[0] == 'newmtl':
+            mtl = contents[values[1]] = {}
+        elif mtl is None:
+            raise ValueError("mtl file doesn't start with newmtl stmt")
+        elif values[0] == 'map_Kd':
+            mtl[values[0]] = values[1]
+            if textures:
+                imagefile = os.path.join(dirname, mtl['map_Kd'])
+                mtl['image_Kd'] = decode_texture(imagefile)
+        else:
+            mtl[values[0]] = list(map(float, values[1:]))
+    return contents
+
+
+def parse_obj(filename, swapyz=False, optimize=True, textures=True, reorder=False):
+    """
+    Parse a Wavefront OBJ file without touching OpenGL.
+
+    Vertex data is returned as flat float arrays so the result is cheap to send
+    between processes.
+
+    Parameters:
+    - filename (str): The path to the Wavefront OBJ file.
+    - swapyz (bool): If True, swap Y and Z coordinates.
+    - optimize (bool): If True, also build the indexed mesh.
+    - textures (bool): If False, texture images are not decoded.
+    - reorder (bool): If True, reorder the mesh triangles for the vertex cache (Tipsify).
+
+    Returns:
+    dict: 'vertices', 'normals', 'texcoords' (array of floats), 'faces' (list),
+    'mtl' (dict from parse_material, or None if the file has no mtllib) and 'mesh'
+    (dict from MeshOptimizer.optimize_mesh, or None).
+    """
+    vertices = array('f')
+    normals = array('f')
+    texcoords = array('f')
+    faces = []
+    mtl = None
+    dirname = os.path.dirname(filename)
+
+    material = None
+    for line in open(filename, "r"):
+        if line.startswith('#'): continue
+        values = line.split()
+        if not values: continue
+        if values[0] == 'v':
+            v = list(map(float, values[1:4]))
+            if swapyz:
+                v = v[0], v[2], v[1]
+            vertices.extend(v)
+        elif values[0] == 'vn':
+            v = list(map(float, values[1:4]))
+            if swapyz:
+                v = v[0], v[2], v[1]
+            normals.extend(v)
+        elif values[0] == 'vt':
+            texcoords.extend(map(float, values[1:3]))
+        elif values[0] in ('usemtl', 'usemat'):
+            material = values[1]
+        elif values[0] == 'mtllib':
+            mtl = parse_material(os.path.join(dirname, values[1]), textures)
+        elif values[0] == 'f':
+            face = []
+            tcs = []
+            norms = []
+            for v in values[1:]:
+                w = v.split('/')
+                face.append(int(w[0]))
+                if len(w) >= 2 and len(w[1]) > 0:
+                    tcs.append(int(w[1]))
+                else:
+                    tcs.append(0)
+                if len(w) >= 3 and len(w[2]) > 0:
+                    norms.append(int(w[2]))
+                else:
+                    norms.append(0)
+            faces.append((face, norms, tcs, material))
+
+    parsed = {'vertices': vertices, 'normals': normals, 'texcoords': texcoords, 'faces': faces, 'mtl': mtl,
+              'mesh': None}
+    if optimize:
+        parsed['mesh'] = optimize_mesh(parsed, reorder=reorder)
+    return parsed
+
+
+def timed_parse_obj(filename, swapyz, reorder=False):
+    """
+    Parse an OBJ file and measure how long it took. Runs in a worker process.
+
+    Parameters:
+    - filename (str): The path to the Wavefront OBJ file.
+    - swapyz (bool): If True, swap Y and Z coordinates.
+    - reorder (bool): If True, reorder the mesh triangles for the vertex cache.
+
+    Returns:
+    tuple: (parsed data from parse_obj, parse time in seconds).
+    """
+    start = time.perf_counter()
+    parsed = parse_obj(filename, swapyz, reorder=reorder)
+    return parsed, time.perf_counter() - start
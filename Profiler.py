@@ -0,0 +1,274 @@
+from OpenGL.GL import *
+from collections import deque
+import json
+import time
+
+
+class Profiler:
+    """
+    Lightweight named-span profiler for the render loop.
+
+    CPU spans are timed with time.perf_counter_ns and kept in fixed-size rolling
+    windows, so memory and per-span cost stay constant during long runs. GPU spans
+    use GL_TIME_ELAPSED queries that are read back a few frames later, without
+    stalling the pipeline.
+
+    Attributes:
+    - enabled (bool): If False, spans are no-ops.
+    - window (int): Number of recent samples kept per span name.
+    - report_every (float): Seconds between periodic reports printed by tick(). 0 disables them.
+    - samples (dict): Span name -> deque of recent durations in seconds.
+    - events (deque): Recent Chrome-trace events.
+
+    Methods:
+    - span(self, name): Context manager timing a CPU stage.
+    - gpu_span(self, name): Context manager timing a GPU stage with a timer query.
+    - record(self, name, duration, start=None): Add a measurement taken elsewhere.
+    - tick(self): Collect finished GPU queries and print a periodic report.
+    - summary(self): Per-span statistics.
+    - report(self): Print per-span statistics.
+    - export(self, filename): Write a Chrome-trace JSON file with the summary.
+    """
+
+    def __init__(self, enabled=True, window=1024, report_every=10.0, max_events=200000, gpu=True):
+        """
+        Initializes a Profiler object.
+
+        Parameters:
+        - enabled (bool): If False, spans are no-ops.
+        - window (int): Number of recent samples kept per span name.
+        - report_every (float): Seconds between periodic reports. 0 disables them.
+        - max_events (int): Number of recent trace events kept for export.
+        - gpu (bool): If True, use GPU timer queries when the driver supports them.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.report_every = report_every
+        self.samples = {}
+        self.events = deque(maxlen=max_events)
+        self.gpu = gpu
+        self._gpu_checked = False
+        self._origin = time.perf_counter_ns()
+        self._last_report = time.perf_counter()
+        self._free_queries = []
+        self._pending_queries = deque()
+
+    def span(self, name):
+        """
+        Time a CPU stage.
+
+        Parameters:
+        - name (str): The stage name.
+
+        Returns:
+        context manager: Use in a with statement around the stage.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def gpu_span(self, name):
+        """
+        Time a GPU stage with a GL_TIME_ELAPSED query. Falls back to a CPU span when
+        the context supports no timer queries (checked on the first call, which must
+        happen with a current context). GPU spans must not be nested.
+
+        Parameters:
+        - name (str): The stage name; the GPU time is recorded as "<name>.gpu".
+
+        Returns:
+        context manager: Use in a with statement around the GL calls.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        if self.gpu and not self._gpu_checked:
+            self._gpu_checked = True
+            self.gpu = timer_queries_supported()
+        if self.gpu:
+            return _GpuSpan(self, name)
+        return _Span(self, name)
+
+    def record(self, name, duration, start=None):
+        """
+        Add a measurement taken elsewhere, e.g. in a worker process.
+
+        Parameters:
+        - name (str): The stage name.
+        - duration (float): The duration in seconds.
+        - start (int): perf_counter_ns() value at the start, if known.
+
+        Returns:
+        None
+        """
+        if not self.enabled:
+            return
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(duration)
+        if start is None:
+            start = time.perf_counter_ns() - int(duration * 1e9)
+        self.events.append((name, start, int(duration * 1e9)))
+
+    def tick(self):
+        """
+        Collect finished GPU queries and print a report every report_every seconds.
+        Call once per frame.
+
+        Returns:
+        None
+        """
+        if not self.enabled:
+            return
+        while self._pending_queries:
+            name, query, start = self._pending_queries[0]
+            if not _scalar(glGetQueryObjectiv(query, GL_QUERY_RESULT_AVAILABLE)):
+                break
+            self._pending_queries.popleft()
+            # Bufor podany jawnie: PyOpenGL nie umie sam zaalokować wyniku 64-bitowego
+            elapsed_ns = (GLuint64 * 1)()
+            glGetQueryObjectui64v(query, GL_QUERY_RESULT, elapsed_ns)
+            self._free_queries.append(query)
+            self.record(name + ".gpu", elapsed_ns[0] / 1e9, start)
+
+        now = time.perf_counter()
+        if self.report_every and now - self._last_report >= self.report_every:
+            self._last_report = now
+            self.report()
+
+    def summary(self):
+        """
+        Compute statistics over the rolling window of every span.
+
+        Returns:
+        dict: Span name -> dict with 'count', 'mean', 'p50', 'p95' and 'max' in milliseconds.
+        """
+        result = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            result[name] = {
+                'count': count,
+                'mean': sum(ordered) / count * 1000,
+                'p50': ordered[count // 2] * 1000,
+                'p95': ordered[min(count - 1, int(count * 0.95))] * 1000,
+                'max': ordered[-1] * 1000,
+            }
+        return result
+
+    def report(self):
+        """
+        Print statistics over the rolling window of every span.
+
+        Returns:
+        None
+        """
+        for name, stats in sorted(self.summary().items()):
+            print(f"[profile] {name:<14} n={stats['count']:<5} mean {stats['mean']:8.3f} ms  "
+                  f"p50 {stats['p50']:8.3f}  p95 {stats['p95']:8.3f}  max {stats['max']:8.3f}")
+
+    def export(self, filename):
+        """
+        Write recent events as a Chrome-trace JSON file (chrome://tracing, Perfetto).
+        The per-span summary is stored under the extra "summary" key.
+
+        Parameters:
+        - filename (str): The output file.
+
+        Returns:
+        None
+        """
+        trace_events = []
+        for name, start, duration in self.events:
+            trace_events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000,
+                'dur': duration / 1000,
+                'pid': 0,
+                'tid': 1 if name.endswith('.gpu') else 0,
+            })
+        with open(filename, 'w') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms', 'summary': self.summary()}, file)
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter_ns() - self.start) / 1e9, self.start)
+        return False
+
+
+class _GpuSpan(_Span):
+    __slots__ = ('query',)
+
+    def __init__(self, profiler, name):
+        super().__init__(profiler, name)
+        self.query = profiler._free_queries.pop() if profiler._free_queries else _scalar(glGenQueries(1))
+
+    def __enter__(self):
+        glBeginQuery(GL_TIME_ELAPSED, self.query)
+        return super().__enter__()
+
+    def __exit__(self, *exc):
+        glEndQuery(GL_TIME_ELAPSED)
+        self.profiler._pending_queries.append((self.name, self.query, self.start))
+        return super().__exit__(*exc)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def timer_queries_supported():
+    """
+    Check whether the current GL context supports GL_TIME_ELAPSED queries.
+
+    Returns:
+    bool: True for GL 3.3 and later or with the GL_ARB_timer_query extension.
+    """
+    version = glGetString(GL_VERSION) or b""
+    try:
+        major, minor = (int(part) for part in version.split()[0].split(b".")[:2])
+    except (IndexError, ValueError):
+        return False
+    if (major, minor) >= (3, 3):
+        return True
+    return b"GL_ARB_timer_query" in (glGetString(GL_EXTENSIONS) or b"").split()
+
+
+def _scalar(value):
+    """
+    Unwrap a single-element result returned by PyOpenGL query getters.
+
+    Parameters:
+    - value: An int or a one-element array.
+
+    Returns:
+    int: The value.
+    """
+    try:
+        return int(value[0])
+    except (TypeError, IndexError):
+        return int(value)
+
+# Profiler shared by the render loop; enabled from the command line
+profiler = Profiler(enabled=False)
@@ -0,0 +1,152 @@
+from OpenGL.GL import *
+import math
+import os
+
+import numpy as np
+
+from Camera import iter_trajectory
+from Framebuffer import Framebuffer
+from Profiler import profiler
+from main import FAR_PLANE, NEAR_PLANE, camera_handle_input, camera_render_object
+
+# Domyślny maksymalny rozmiar kafelka, niezależnie od limitów sterownika
+DEFAULT_TILE_SIZE = 4096
+
+
+def max_tile_size(supersample=1):
+    """
+    Return the largest square tile the driver can render into.
+
+    Parameters:
+    - supersample (int): Supersampling factor of the tile target.
+
+    Returns:
+    int: The tile edge in output pixels.
+    """
+    max_viewport = glGetIntegerv(GL_MAX_VIEWPORT_DIMS)
+    max_size = min(glGetIntegerv(GL_MAX_RENDERBUFFER_SIZE), max_viewport[0], max_viewport[1])
+    return min(DEFAULT_TILE_SIZE, max_size // supersample)
+
+
+def setup_tile_projection(camera, width, height, x, y, tile_width, tile_height):
+    """
+    Set up the part of the camera frustum that covers one tile of the full image.
+
+    Together the tiles reproduce the projection camera_setup_projection sets up for
+    the full width x height image.
+
+    Parameters:
+    - camera (Camera): The camera for which to set up the projection.
+    - width (int): The width of the full image.
+    - height (int): The height of the full image.
+    - x (int): The left edge of the tile in pixels.
+    - y (int): The bottom edge of the tile in pixels.
+    - tile_width (int): The width of the tile in pixels.
+    - tile_height (int): The height of the tile in pixels.
+
+    Returns:
+    None
+    """
+    top = NEAR_PLANE * math.tan(math.radians(camera.field_of_view) / 2)
+    right = top * width / float(height)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glFrustum(-right + 2 * right * x / width, -right + 2 * right * (x + tile_width) / width,
+              -top + 2 * top * y / height, -top + 2 * top * (y + tile_height) / height,
+              NEAR_PLANE, FAR_PLANE)
+    glMatrixMode(GL_MODELVIEW)
+
+
+def open_ppm(filename, width, height):
+    """
+    Create a binary PPM image file and map its pixels into memory.
+
+    Parameters:
+    - filename (str): The output file.
+    - width (int): The image width.
+    - height (int): The image height.
+
+    Returns:
+    numpy.memmap: uint8 array of shape (height, width, 3), top row first.
+    """
+    header = f"P6\n{width} {height}\n255\n".encode("ascii")
+    with open(filename, 'wb') as file:
+        file.write(header)
+        file.truncate(len(header) + width * height * 3)
+    return np.memmap(filename, np.uint8, 'r+', offset=len(header), shape=(height, width, 3))
+
+
+def render_tiled(objects, camera, width, height, filename, tile_size=None, samples=0, supersample=1):
+    """
+    Render one view at a resolution above the viewport limits, tile by tile.
+
+    Each tile is rendered with its own sub-frustum into an offscreen target, read
+    back and written into a memory-mapped PPM file, so peak memory is one tile plus
+    the pages the OS has not written back yet.
+
+    Parameters:
+    - objects (list): A list of objects to render.
+    - camera (Camera): The camera to render with.
+    - width (int): The output width in pixels.
+    - height (int): The output height in pixels.
+    - filename (str): The output .ppm file.
+    - tile_size (int): The tile edge in pixels. Defaults to max_tile_size().
+    - samples (int): MSAA samples per pixel.
+    - supersample (int): Supersampling factor, a power of two.
+
+    Returns:
+    None
+    """
+    tile_size = min(tile_size or max_tile_size(supersample), max_tile_size(supersample))
+    tile_width, tile_height = min(tile_size, width), min(tile_size, height)
+    framebuffer = Framebuffer(tile_width, tile_height, samples, supersample)
+    image = open_ppm(filename, width, height)
+    try:
+        framebuffer.bind()
+        for y in range(0, height, tile_height):
+            for x in range(0, width, tile_width):
+                camera_handle_input(camera)
+                # Kafelki na krawędzi wychodzą poza obraz; nadmiar jest odcinany przy kopiowaniu
+                setup_tile_projection(camera, width, height, x, y, tile_width, tile_height)
+                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                with profiler.gpu_span("draw"):
+                    for obj in objects:
+                        camera_render_object(obj, camera)
+                with profiler.span("readback"):
+                    pixels = framebuffer.read_pixels()
+                with profiler.span("disk"):
+                    tile = np.frombuffer(pixels, np.uint8).reshape(tile_height, tile_width, 4)
+                    used_width, used_height = min(tile_width, width - x), min(tile_height, height - y)
+                    # Wiersze OpenGL idą od dołu, a w PPM od góry
+                    image[height - y - used_height:height - y, x:x + used_width] = \
+                        tile[used_height - 1::-1, :used_width, :3]
+                    image.flush()
+                profiler.tick()
+    finally:
+        framebuffer.unbind()
+        framebuffer.free()
+        del image
+
+
+def render_with_some_cameras_tiled(objects, cameras, png_dir, width, height, tile_size=None, samples=0,
+                                   supersample=1):
+    """
+    Render the key pose of every camera at a high resolution with tiled rendering.
+
+    Parameters:
+    - objects (list): A list of objects to render.
+    - cameras (list): A list of Camera objects.
+    - png_dir (str): The folder to save the images to.
+    - width (int): The output width in pixels.
+    - height (int): The output height in pixels.
+    - tile_size (int): The tile edge in pixels. Defaults to max_tile_size().
+    - samples (int): MSAA samples per pixel.
+    - supersample (int): Supersampling factor, a power of two.
+
+    Returns:
+    None
+    """
+    for camera, frame in iter_trajectory(cameras):
+        if frame == 0:
+            filename = os.path.join(png_dir, f"camera_{camera.id}_{width}x{height}.ppm")
+            render_tiled(objects, camera, width, height, filename, tile_size, samples, supersample)
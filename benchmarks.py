@@ -0,0 +1,173 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+from Framebuffer import Framebuffer
+from main import DATASET_PROJECTION, VIEWPORT, camera_render_object, camera_setup_projection, init, \
+    load_cameras_from_json, load_objects_from_json, read_frame
+
+# Konfiguracje antyaliasingu: (nazwa, próbki MSAA, współczynnik SSAA). Bez antyaliasingu
+# zbiór danych jest renderowany w oknie, więc "none" też mierzy okno
+AA_CONFIGS = [
+    ("none", 0, 1),
+    ("msaa2", 2, 1),
+    ("msaa4", 4, 1),
+    ("msaa8", 8, 1),
+    ("ssaa2", 0, 2),
+    ("msaa4+ssaa2", 4, 2),
+]
+AA_REFERENCE = ("reference (msaa8+ssaa4)", 8, 4)
+
+
+def render_views(objects, cameras, framebuffer, frames):
+    """
+    Render and read back frames from the given cameras, cycling through them.
+
+    Parameters:
+    - objects (list): A list of objects to render.
+    - cameras (list): A list of Camera objects used as fixed poses.
+    - framebuffer (Framebuffer): The target to render into, or None for the window.
+    - frames (int): Number of frames to render.
+
+    Returns:
+    tuple: (list of the last image of every camera as arrays, seconds per frame).
+    """
+    if framebuffer is not None:
+        framebuffer.bind()
+    images = [None] * len(cameras)
+    glFinish()
+    start = time.perf_counter()
+    for frame in range(frames):
+        camera = cameras[frame % len(cameras)]
+        camera_setup_projection(camera, *DATASET_PROJECTION)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        for obj in objects:
+            camera_render_object(obj, camera)
+        if framebuffer is None:
+            pygame.display.flip()
+        images[frame % len(cameras)] = read_frame(framebuffer)
+    elapsed = time.perf_counter() - start
+    if framebuffer is not None:
+        framebuffer.unbind()
+    arrays = [np.frombuffer(pixels, np.uint8).reshape(height, width, 4)[..., :3]
+              for pixels, (width, height) in images]
+    return arrays, elapsed / frames
+
+
+def benchmark_antialiasing(objects, cameras, frames=120):
+    """
+    Compare throughput and quality of the anti-aliasing modes.
+
+    Quality is measured against a heavily anti-aliased reference render of the same
+    poses, as PSNR and mean absolute error. Every mode reads back output-sized pixels,
+    so the time difference is the cost of rendering and resolving on the GPU. The
+    "none" mode renders into the window, as the dataset mode does without anti-aliasing.
+
+    Parameters:
+    - objects (list): A list of objects to render.
+    - cameras (list): A list of Camera objects used as fixed poses.
+    - frames (int): Number of frames rendered per mode.
+
+    Returns:
+    list: One dict per mode with 'name', 'ms_per_frame', 'fps', 'psnr' and 'mae'.
+    """
+    width, height = VIEWPORT
+    name, samples, supersample = AA_REFERENCE
+    framebuffer = Framebuffer(width, height, samples, supersample)
+    reference, _ = render_views(objects, cameras, framebuffer, len(cameras))
+    framebuffer.free()
+
+    results = []
+    for name, samples, supersample in AA_CONFIGS:
+        framebuffer = None
+        if samples > 1 or supersample > 1:
+            framebuffer = Framebuffer(width, height, samples, supersample)
+        # Jedna klatka rozgrzewkowa na każdą kamerę
+        render_views(objects, cameras, framebuffer, len(cameras))
+        images, seconds = render_views(objects, cameras, framebuffer, frames)
+        if framebuffer is not None:
+            framebuffer.free()
+
+        errors = [np.abs(image.astype(np.int16) - ref) for image, ref in zip(images, reference)]
+        mse = np.mean([np.mean(error.astype(np.float64) ** 2) for error in errors])
+        results.append({
+            'name': name,
+            'ms_per_frame': seconds * 1000,
+            'fps': 1 / seconds,
+            'psnr': 10 * np.log10(255 ** 2 / mse) if mse else float('inf'),
+            'mae': float(np.mean([np.mean(error) for error in errors])),
+        })
+    return results
+
+
+def benchmark_cold_start(repeats=10):
+    """
+    Measure the wall-clock start-up time of fresh interpreter processes.
+
+    Each command is run repeats times; the minimum and the median are reported,
+    since the minimum is the least disturbed by other load on the machine. The
+    worker rows open a window, so they need a display (or SDL_VIDEODRIVER=offscreen).
+
+    Parameters:
+    - repeats (int): Number of runs per command.
+
+    Returns:
+    list: One dict per command with 'name', 'min_ms' and 'median_ms'.
+    """
+    with tempfile.TemporaryDirectory(prefix="bench_queue_") as queue_dir, \
+            tempfile.TemporaryDirectory(prefix="bench_empty_queue_") as empty_queue_dir:
+        commands = [
+            ("interpreter only", [sys.executable, "-c", "pass"]),
+            ("parse worker (ObjParser)", [sys.executable, "-c", "import ObjParser"]),
+            ("main.py enqueue", [sys.executable, "main.py", "enqueue", "jobs.json", "--queue", queue_dir]),
+            ("run.py enqueue", [sys.executable, "run.py", "enqueue", "jobs.json", "--queue", queue_dir]),
+            ("import main", [sys.executable, "-c", "import main"]),
+            ("import main, GL checks off", [sys.executable, "-c", "import OpenGL; OpenGL.ERROR_CHECKING = False; "
+                                                                  "OpenGL.ERROR_LOGGING = False; import main"]),
+            # Okno, kontekst GL i jedno sprawdzenie pustej kolejki - start workera bez renderowania
+            ("main.py worker, empty queue", [sys.executable, "main.py", "worker", "--queue", empty_queue_dir]),
+            ("run.py worker, empty queue", [sys.executable, "run.py", "worker", "--queue", empty_queue_dir]),
+        ]
+        results = []
+        for name, command in commands:
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=os.path.dirname(__file__) or ".")
+                times.append((time.perf_counter() - start) * 1000)
+            times.sort()
+            results.append({'name': name, 'min_ms': times[0], 'median_ms': times[len(times) // 2]})
+    return results
+
+
+def main():
+    """
+    Run the benchmark named on the command line.
+
+    Returns:
+    None
+    """
+    if sys.argv[1] == "aa":
+        init()
+        objects = load_objects_from_json("objects.json")
+        cameras = load_cameras_from_json("cameras.json")
+        print(f"{'mode':<14} {'ms/frame':>9} {'fps':>8} {'PSNR dB':>8} {'MAE':>6}")
+        for result in benchmark_antialiasing(objects, cameras):
+            print(f"{result['name']:<14} {result['ms_per_frame']:9.2f} {result['fps']:8.1f} "
+                  f"{result['psnr']:8.2f} {result['mae']:6.2f}")
+        pygame.quit()
+
+    elif sys.argv[1] == "startup":
+        print(f"{'command':<28} {'min ms':>8} {'median ms':>10}")
+        for result in benchmark_cold_start():
+            print(f"{result['name']:<28} {result['min_ms']:8.1f} {result['median_ms']:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+
+# Tryby bez okna interaktywnego - PyOpenGL nie musi w nich sprawdzać błędów
+BATCH_MODES = ("dataset", "jobs", "enqueue", "worker", "tiled")
+# Tryby zapisujące zbiór danych klatka po klatce - tylko one obsługują pamięć klatek i pomijanie duplikatów
+FRAME_MODES = ("dataset", "jobs", "worker")
+
+
+def parse_size(text):
+    """
+    Parse an image size given as WIDTHxHEIGHT.
+
+    Parameters:
+    - text (str): The size, e.g. "7680x4320".
+
+    Returns:
+    tuple: (width, height).
+    """
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+
+    Parameters:
+    - argv (list): Arguments to parse. Defaults to sys.argv[1:].
+
+    Returns:
+    argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Render scenes and generate image datasets.")
+    parser.add_argument("mode", choices=["dataset", "obj", "json", "cam", "jobs", "enqueue", "worker", "tiled"])
+    parser.add_argument("source", nargs="?",
+                        help="Scene source for the cam mode (obj or json), or job spec file for jobs and enqueue.")
+    parser.add_argument("--queue", default="job_queue", help="Job queue directory for enqueue and worker.")
+    parser.add_argument("--poll", type=float, metavar="SECONDS",
+                        help="Keep the worker waiting for new jobs, polling the queue at this interval.")
+    parser.add_argument("--profile", nargs="?", const="profile_trace.json", metavar="TRACE_FILE",
+                        help="Time each render stage, print periodic reports and write a Chrome trace on exit.")
+    parser.add_argument("--msaa", type=int, default=0, metavar="SAMPLES",
+                        help="Render dataset frames offscreen with this many MSAA samples per pixel.")
+    parser.add_argument("--ssaa", type=int, default=1, metavar="FACTOR",
+                        help="Render dataset frames offscreen at FACTOR times the output size (power of two).")
+    parser.add_argument("--atlas", type=int, default=1, metavar="VIEWS",
+                        help="In dataset mode, render this many camera poses per pass into one offscreen atlas.")
+    parser.add_argument("--frame-cache", nargs="?", const=".frame_cache", metavar="DIR",
+                        help="Reuse frames rendered by earlier runs from this cache folder (dataset, jobs, worker).")
+    parser.add_argument("--frame-cache-size", type=int, default=2048, metavar="MIB",
+                        help="Size cap of the frame cache; least recently used frames are evicted.")
+    parser.add_argument("--skip-pose", type=float, nargs=2, metavar=("DISTANCE", "DEGREES"),
+                        help="Skip dataset frames whose camera moved less than DISTANCE and turned less than DEGREES "
+                             "since the last saved frame.")
+    parser.add_argument("--skip-phash", type=int, metavar="BITS",
+                        help="Drop rendered dataset frames whose 64-bit perceptual hash differs from the last saved "
+                             "frame in at most BITS bits.")
+    parser.add_argument("--tipsify", action="store_true",
+                        help="Reorder the triangles of loaded models for the GPU vertex cache. Slows down loading.")
+    parser.add_argument("--size", type=parse_size, default=(7680, 4320), metavar="WIDTHxHEIGHT",
+                        help="Output resolution of the tiled mode.")
+    parser.add_argument("--tile", type=int, metavar="PIXELS",
+                        help="Tile edge of the tiled mode. Defaults to the largest the driver supports, up to 4096.")
+    parser.add_argument("--debug-gl", action="store_true",
+                        help="Keep PyOpenGL error checking and logging on in batch modes (run.py only).")
+    args = parser.parse_args(argv)
+    if args.mode == "cam" and args.source not in ("obj", "json"):
+        parser.error("cam mode needs a source: obj or json")
+    if args.mode in ("jobs", "enqueue") and args.source is None:
+        parser.error(f"{args.mode} mode needs a job spec file")
+    if args.atlas > 1 and args.mode != "dataset":
+        parser.error("--atlas is only supported in dataset mode")
+    unsupported = [option for option, value in (("--frame-cache", args.frame_cache),
+                                                 ("--skip-pose", args.skip_pose),
+                                                 ("--skip-phash", args.skip_phash)) if value is not None]
+    if unsupported and args.atlas > 1:
+        parser.error(f"--atlas cannot be combined with {', '.join(unsupported)}")
+    if unsupported and args.mode not in FRAME_MODES:
+        parser.error(f"{', '.join(unsupported)} cannot be used in {args.mode} mode")
+    return args
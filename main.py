@@ -1,17 +1,29 @@
-from pygame.constants import *
-from pygame.locals import *
+import pygame
+from pygame.locals import DOUBLEBUF, KEYDOWN, K_ESCAPE, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION, OPENGL, QUIT
 from OpenGL.GL import *
-from OpenGL.GLU import *
-from OpenGL.GLUT import *
-from OBJ import *
+from OpenGL.GLU import gluPerspective
+from OBJ import OBJ
 import json
 import sys
-from Camera import *
+from Camera import Camera, iter_trajectory
+from Profiler import profiler
+from cli import parse_args
 from datetime import datetime
+import io
 import os
+import time
 
 rotate = False
 move = False
+VIEWPORT = (800, 600)
+NEAR_PLANE = 1
+FAR_PLANE = 100.0
+LIGHT_POSITION = (-40, 200, 100, 0.0)
+LIGHT_AMBIENT = (0.2, 0.2, 0.2, 1.0)
+LIGHT_DIFFUSE = (0.5, 0.5, 0.5, 1.0)
+# Proporcje rzutowania klatek zbioru danych: 1:1, jak od początku w oknie 800x600.
+# Wspólne dla okna i celów poza ekranem, żeby --msaa/--ssaa nie zmieniały kadru
+DATASET_PROJECTION = (1000, 1000)
 
 
 def init_camera():
@@ -156,7 +168,7 @@ def camera_setup_projection(camera, width, height):
     """
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
-    gluPerspective(camera.field_of_view, width / float(height), 1, 100.0)
+    gluPerspective(camera.field_of_view, width / float(height), NEAR_PLANE, FAR_PLANE)
     glEnable(GL_DEPTH_TEST)
     glMatrixMode(GL_MODELVIEW)
 
@@ -169,14 +181,14 @@ def init():
     None
     """
     pygame.init()
-    viewport = (800, 600)
+    viewport = VIEWPORT
     hx, hy = viewport[0] / 2, viewport[1] / 2
     srf = pygame.display.set_mode(viewport, OPENGL | DOUBLEBUF)
 
     glEnable(GL_LIGHT0)
-    glLightfv(GL_LIGHT0, GL_POSITION, (-40, 200, 100, 0.0))
-    glLightfv(GL_LIGHT0, GL_AMBIENT, (0.2, 0.2, 0.2, 1.0))
-    glLightfv(GL_LIGHT0, GL_DIFFUSE, (0.5, 0.5, 0.5, 1.0))
+    glLightfv(GL_LIGHT0, GL_POSITION, LIGHT_POSITION)
+    glLightfv(GL_LIGHT0, GL_AMBIENT, LIGHT_AMBIENT)
+    glLightfv(GL_LIGHT0, GL_DIFFUSE, LIGHT_DIFFUSE)
 
     glEnable(GL_LIGHTING)
     glEnable(GL_COLOR_MATERIAL)
@@ -189,24 +201,42 @@ def init():
     glMaterialfv(GL_FRONT_AND_BACK, GL_SHININESS, 50.0)
 
 
-def load_objects_from_json(json_filename):
+def load_objects_from_json(json_filename, max_workers=None, cache=None, reorder=False):
     """
     Load object data from a JSON file.
 
+    Meshes are parsed and textures decoded in a process pool; only the OpenGL
+    uploads run on the calling thread. Per-asset timings are printed. Relative
+    model filenames are resolved against the folder of the JSON file.
+
     Parameters:
     - json_filename (str): The filename of the JSON file containing object data.
+    - max_workers (int): Number of parsing processes. By default small scenes are
+      parsed serially; see AssetLoader.parse_objects_parallel.
+    - cache (AssetCache): If given, objects are taken from and kept in this cache.
+    - reorder (bool): If True, reorder the mesh triangles for the vertex cache
+      (Tipsify). A cache uses its own setting.
 
     Returns:
     list: A list of OBJ objects.
     """
+    from AssetLoader import load_objects_parallel, print_load_report
     with open(json_filename, 'r') as file:
         objects_data = json.load(file)
-
-    objects = []
+    base_dir = os.path.dirname(json_filename)
     for obj_data in objects_data:
-        obj = OBJ(obj_data["filename"], obj_data.get("swapyz", False), obj_data.get("position"),
-                  obj_data.get("rotation"))
-        objects.append(obj)
+        obj_data["filename"] = os.path.join(base_dir, obj_data["filename"])
+
+    start = time.perf_counter()
+    if cache is not None:
+        objects, timings = cache.load(objects_data, max_workers)
+    else:
+        objects, timings = load_objects_parallel(objects_data, max_workers, reorder)
+    print_load_report(timings, time.perf_counter() - start)
+    for timing in timings:
+        if 'parse' in timing:
+            profiler.record("parse", timing['parse'])
+        profiler.record("gl_compile", timing['upload'])
 
     return objects
 
@@ -224,7 +254,7 @@ def setup_projection(width, height):
     """
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
-    gluPerspective(90.0, width / float(height), 1, 100.0)
+    gluPerspective(90.0, width / float(height), NEAR_PLANE, FAR_PLANE)
     glEnable(GL_DEPTH_TEST)
     glMatrixMode(GL_MODELVIEW)
 
@@ -358,9 +388,9 @@ def render_object(obj, tx, ty, zpos, rx, ry):
 
     glEnable(GL_LIGHTING)
     glEnable(GL_LIGHT0)
-    glLightfv(GL_LIGHT0, GL_POSITION, (-40, 200, 100, 0.0))
-    glLightfv(GL_LIGHT0, GL_AMBIENT, (0.2, 0.2, 0.2, 1.0))
-    glLightfv(GL_LIGHT0, GL_DIFFUSE, (0.5, 0.5, 0.5, 1.0))
+    glLightfv(GL_LIGHT0, GL_POSITION, LIGHT_POSITION)
+    glLightfv(GL_LIGHT0, GL_AMBIENT, LIGHT_AMBIENT)
+    glLightfv(GL_LIGHT0, GL_DIFFUSE, LIGHT_DIFFUSE)
 
     glTranslate(tx[0] / 20., ty[0] / 20., -zpos[0])
     glRotate(ry[0], 1, 0, 0)
@@ -368,35 +398,101 @@ def render_object(obj, tx, ty, zpos, rx, ry):
     obj.render()
 
 
-def create_folder():
+def create_folder(folder_name=None):
     """
-    Create a folder with a timestamped name.
+    Create an output folder, by default with a timestamped name.
+
+    Parameters:
+    - folder_name (str): The folder to create. It may already exist.
 
     Returns:
     str: The name of the created folder.
     """
-    time_now = datetime.now()
-    folder_name = time_now.strftime('%d%m%Y_%H%M')
-    os.makedirs(f'./{folder_name}')
+    if folder_name is None:
+        time_now = datetime.now()
+        folder_name = time_now.strftime('%d%m%Y_%H%M')
+        os.makedirs(f'./{folder_name}')
+    else:
+        os.makedirs(folder_name, exist_ok=True)
     return folder_name
 
 
-def capture_screenshot(camera_id, frame, folder_name):
+def capture_screenshot(camera_id, frame, folder_name, framebuffer=None):
     """
     Capture and save a screenshot for a specific camera.
 
     Parameters:
     - camera_id (int): The ID of the camera.
+    - frame (int): The frame number within the camera transition.
     - folder_name (str): The name of the folder to save the screenshot.
+    - framebuffer (Framebuffer): Offscreen target to read from. Defaults to the window.
 
     Returns:
     None
     """
-    screen = pygame.display.get_surface()
-    size = screen.get_size()
-    buffer = glReadPixels(0, 0, *size, GL_RGBA, GL_UNSIGNED_BYTE)
-    screen_surf = pygame.image.fromstring(buffer, size, "RGBA")
-    pygame.image.save(screen_surf, f"./{folder_name}/screenshot_camera_{camera_id}_{frame}.jpg")
+    buffer, size = read_frame(framebuffer)
+    save_frame(buffer, size, screenshot_path(folder_name, camera_id, frame))
+
+
+def read_frame(framebuffer=None):
+    """
+    Read the rendered pixels back from OpenGL.
+
+    Parameters:
+    - framebuffer (Framebuffer): Offscreen target to read from. Defaults to the window.
+
+    Returns:
+    tuple: (RGBA pixels as bytes, (width, height)).
+    """
+    if framebuffer is not None:
+        size = (framebuffer.width, framebuffer.height)
+        with profiler.span("readback"):
+            buffer = framebuffer.read_pixels()
+    else:
+        screen = pygame.display.get_surface()
+        size = screen.get_size()
+        with profiler.span("readback"):
+            buffer = glReadPixels(0, 0, *size, GL_RGBA, GL_UNSIGNED_BYTE)
+    return buffer, size
+
+
+def screenshot_path(folder_name, camera_id, frame):
+    """
+    Build the file name of a dataset frame.
+
+    Parameters:
+    - folder_name (str): The output folder.
+    - camera_id (int): The ID of the camera.
+    - frame (int): The frame number within the camera transition.
+
+    Returns:
+    str: The path of the image file.
+    """
+    return os.path.join(folder_name, f"screenshot_camera_{camera_id}_{frame}.jpg")
+
+
+def save_frame(buffer, size, filename):
+    """
+    Encode raw pixels read from OpenGL and write them to an image file.
+
+    Parameters:
+    - buffer (bytes): RGBA pixels as returned by glReadPixels.
+    - size (tuple): The (width, height) of the image.
+    - filename (str): The output file; its extension selects the format.
+
+    Returns:
+    None
+    """
+    with profiler.span("convert"):
+        screen_surf = pygame.image.fromstring(buffer, size, "RGBA")
+    with profiler.span("encode"):
+        encoded = io.BytesIO()
+        pygame.image.save(screen_surf, encoded, filename)
+    with profiler.span("disk"):
+        # Nowy plik zamiast nadpisywania: stary może być twardym linkiem do pamięci podręcznej klatek
+        with open(filename + ".tmp", 'wb') as file:
+            file.write(encoded.getbuffer())
+        os.replace(filename + ".tmp", filename)
 
 
 def render_with_one_camera(objects):
@@ -474,76 +570,319 @@ def render_with_some_cameras(objects, cameras, png_dir):
             target_camera = cameras[target_camera_index]
 
 
-def render_with_some_cameras_dataset(objects, cameras, png_dir):
+def render_with_some_cameras_dataset(objects, cameras, png_dir, framebuffer=None, frame_cache=None,
+                                     duplicate_filter=None):
     """
     Render the scene using multiple cameras, iterating through cameras only once.
 
+    A manifest.json listing every frame of the trajectory, with its status
+    (rendered, cached or skipped), is written to png_dir.
+
     Parameters:
     - objects (list): A list of objects to render.
     - cameras (list): A list of Camera objects.
+    - png_dir (str): The folder to save the screenshots to.
+    - framebuffer (Framebuffer): Offscreen (anti-aliased) target to render into.
+      Defaults to the window.
+    - frame_cache (FrameCache): If given, frames found in the cache are linked into
+      png_dir instead of being rendered, and rendered frames are added to it.
+    - duplicate_filter (DuplicateFilter): If given, near-duplicate frames are skipped
+      and only recorded in the manifest.
 
     Returns:
     None
     """
     clock = pygame.time.Clock()
-    width, height = 1000, 1000
+    width, height = DATASET_PROJECTION
+    if framebuffer is not None:
+        framebuffer.bind()
     camera_setup_projection(cameras[0], width, height)
-    current_camera_index = 0
-    current_camera = cameras[current_camera_index]
-    target_camera_index = (current_camera_index + 1) % len(cameras)
-    target_camera = cameras[target_camera_index]
-    frame_count = 0
-
-    while current_camera_index < len(cameras):  # Modify the loop condition
-        clock.tick(30)
-        camera_handle_input(current_camera)
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    if frame_cache is not None:
+        from FrameCache import frame_key, scene_digest
+        scene = scene_digest(objects, render_settings(width, height, framebuffer))
+
+    if duplicate_filter is not None:
+        duplicate_filter.reset()
+    manifest = []
+
+    for camera, frame_count in iter_trajectory(cameras):
+        filename = screenshot_path(png_dir, camera.id, frame_count)
+        entry = {'file': os.path.basename(filename), 'camera_id': camera.id, 'frame': frame_count,
+                 'position': list(camera.position), 'direction': list(camera.direction),
+                 'up_vector': list(camera.up_vector)}
+        manifest.append(entry)
+        if duplicate_filter is not None:
+            skip, metrics = duplicate_filter.same_pose(camera)
+            if skip:
+                entry.update(status='skipped', reason='pose',
+                             duplicate_of=os.path.basename(duplicate_filter.last_file), **metrics)
+                continue
+
+        if frame_cache is not None:
+            # The projection is set up once, with the field of view of the first camera
+            key = frame_key(scene, camera, cameras[0].field_of_view)
+            if frame_cache.fetch(key, filename):
+                entry['status'] = 'cached'
+                if duplicate_filter is not None:
+                    duplicate_filter.keep_file(camera, filename)
+                continue
+
+        with profiler.span("throttle"):
+            clock.tick(30)
+        camera_handle_input(camera)
+        with profiler.span("clear"):
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         # Render all objects on the scene
-        for obj in objects:
-            camera_render_object(obj, current_camera)
+        with profiler.gpu_span("draw"):
+            for obj in objects:
+                camera_render_object(obj, camera)
+
+        if framebuffer is None:
+            with profiler.span("flip"):
+                pygame.display.flip()
+        profiler.tick()
+        buffer, size = read_frame(framebuffer)
+        if duplicate_filter is not None:
+            skip, distance = duplicate_filter.same_image(buffer, size)
+            if skip:
+                entry.update(status='skipped', reason='phash',
+                             duplicate_of=os.path.basename(duplicate_filter.last_file), hash_distance=distance)
+                continue
+            duplicate_filter.keep(camera, filename)
+        save_frame(buffer, size, filename)
+        entry['status'] = 'rendered'
+        if frame_cache is not None:
+            frame_cache.store(key, filename)
+
+    if framebuffer is not None:
+        framebuffer.unbind()
+    write_manifest(png_dir, manifest)
+    if frame_cache is not None:
+        frame_cache.report()
+    if duplicate_filter is not None:
+        duplicate_filter.report()
+
+
+def write_manifest(png_dir, frames):
+    """
+    Write the manifest.json of a dataset folder.
 
-        pygame.display.flip()
-        # Check for camera switch
-        if frame_count <= current_camera.transition_frames:
-            # Interpolate between current and target camera
-            current_camera.interpolate(target_camera, frame_count, current_camera.transition_frames)
-            capture_screenshot(current_camera.id, frame_count, png_dir)
-            frame_count += 1
+    Parameters:
+    - png_dir (str): The dataset folder.
+    - frames (list): One dict per trajectory frame: 'file', 'camera_id', 'frame',
+      the camera pose and 'status' (rendered, cached or skipped).
+
+    Returns:
+    None
+    """
+    with open(os.path.join(png_dir, "manifest.json"), 'w') as file:
+        json.dump({'frames': frames}, file, indent=2)
+
+
+def render_settings(width, height, framebuffer=None):
+    """
+    Describe the settings, other than scene and camera, that affect rendered frames.
+
+    Parameters:
+    - width (int): The width used for the projection aspect ratio.
+    - height (int): The height used for the projection aspect ratio.
+    - framebuffer (Framebuffer): The offscreen target, or None for the window.
+
+    Returns:
+    dict: JSON-serialisable settings.
+    """
+    if framebuffer is not None:
+        target = {'size': [framebuffer.width, framebuffer.height], 'msaa': framebuffer.samples,
+                  'ssaa': framebuffer.supersample}
+    else:
+        target = {'size': list(VIEWPORT), 'window': True}
+    return {
+        'projection': [width, height, NEAR_PLANE, FAR_PLANE],
+        'lighting': [LIGHT_POSITION, LIGHT_AMBIENT, LIGHT_DIFFUSE],
+        'target': target,
+        'encoder': {'format': 'jpg', 'pygame': pygame.version.ver},
+    }
+
+
+def run_job(job, cache, framebuffer=None, frame_cache=None, duplicate_filter=None):
+    """
+    Render one dataset job, reusing the current GL context and cached assets.
+
+    Parameters:
+    - job (dict): Job with "objects", "cameras" and "output" entries.
+    - cache (AssetCache): Asset cache shared by the jobs of this process.
+    - framebuffer (Framebuffer): Offscreen target to render into. Defaults to the window.
+    - frame_cache (FrameCache): Persistent cache of rendered frames.
+    - duplicate_filter (DuplicateFilter): Skips near-duplicate frames.
+
+    Returns:
+    None
+    """
+    png_dir = create_folder(job["output"])
+    objects = load_objects_from_json(job["objects"], cache=cache)
+    cameras = load_cameras_from_json(job["cameras"])
+    start = time.perf_counter()
+    render_with_some_cameras_dataset(objects, cameras, png_dir, framebuffer, frame_cache, duplicate_filter)
+    print(f"[job] {job['objects']} + {job['cameras']} -> {png_dir} in {time.perf_counter() - start:.1f} s "
+          f"(asset cache: {cache.hits} hits, {cache.misses} misses)")
+
+
+def run_jobs(jobs, framebuffer=None, frame_cache=None, duplicate_filter=None, reorder=False):
+    """
+    Render several dataset jobs back-to-back in this process.
+
+    Parameters:
+    - jobs (list): Job dictionaries as returned by load_job_spec.
+    - framebuffer (Framebuffer): Offscreen target to render into. Defaults to the window.
+    - frame_cache (FrameCache): Persistent cache of rendered frames.
+    - duplicate_filter (DuplicateFilter): Skips near-duplicate frames.
+    - reorder (bool): If True, reorder the mesh triangles for the vertex cache (Tipsify).
+
+    Returns:
+    None
+    """
+    from AssetLoader import AssetCache
+    cache = AssetCache(reorder)
+    for job in jobs:
+        run_job(job, cache, framebuffer, frame_cache, duplicate_filter)
+
+
+def run_worker(queue_dir, poll_interval=None, framebuffer=None, frame_cache=None, duplicate_filter=None,
+               reorder=False):
+    """
+    Pull jobs from a queue directory until it is empty.
+
+    Several workers may share one queue directory. Jobs a worker on this host left
+    in the running folder when it died are put back into the queue, and a job
+    interrupted by closing the window or Ctrl+C is released before exiting.
+
+    Parameters:
+    - queue_dir (str): The queue directory.
+    - poll_interval (float): If given, wait this many seconds for new jobs instead
+      of stopping when the queue is empty.
+    - framebuffer (Framebuffer): Offscreen target to render into. Defaults to the window.
+    - frame_cache (FrameCache): Persistent cache of rendered frames.
+    - duplicate_filter (DuplicateFilter): Skips near-duplicate frames.
+    - reorder (bool): If True, reorder the mesh triangles for the vertex cache (Tipsify).
+
+    Returns:
+    None
+    """
+    from AssetLoader import AssetCache
+    from JobQueue import claim_job, finish_job, init_queue, release_job, requeue_stale_jobs
+    init_queue(queue_dir)
+    cache = AssetCache(reorder)
+    while True:
+        for path in requeue_stale_jobs(queue_dir):
+            print(f"[job] requeued {path} of a worker that is gone")
+        claimed = claim_job(queue_dir)
+        if claimed is None:
+            if poll_interval is None:
+                return
+            time.sleep(poll_interval)
+            continue
+        path, job = claimed
+        try:
+            run_job(job, cache, framebuffer, frame_cache, duplicate_filter)
+        except Exception as error:
+            print(f"[job] {path} failed: {error}")
+            finish_job(queue_dir, path, error)
+        except BaseException:
+            # Zamknięcie okna, Esc lub Ctrl+C - zadanie wraca do kolejki dla innego workera
+            release_job(queue_dir, path)
+            raise
         else:
-            frame_count = 0
-            # Switch to the next camera
-            current_camera_index += 1
-            if current_camera_index < len(cameras):
-                current_camera = cameras[current_camera_index]
-                target_camera_index = (current_camera_index + 1) % len(cameras)
-                target_camera = cameras[target_camera_index]
+            finish_job(queue_dir, path)
+
 
-def main():
+def main(args=None):
     """
     Main function to run the program based on command line arguments.
 
+    Parameters:
+    - args (argparse.Namespace): Already parsed arguments. Defaults to parsing sys.argv.
+
+    Returns:
+    None
+    """
+    if args is None:
+        args = parse_args()
+    profiler.enabled = args.profile is not None
+    try:
+        run(args)
+    finally:
+        if profiler.enabled:
+            profiler.report()
+            profiler.export(args.profile)
+
+
+def dataset_options(args):
+    """
+    Build the offscreen target, frame cache and duplicate filter requested on the
+    command line for the modes that render datasets frame by frame.
+
+    Parameters:
+    - args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+    tuple: (Framebuffer, FrameCache, DuplicateFilter), each None if not requested.
+    """
+    framebuffer = None
+    if args.msaa > 1 or args.ssaa > 1:
+        from Framebuffer import Framebuffer
+        framebuffer = Framebuffer(*VIEWPORT, samples=args.msaa, supersample=args.ssaa)
+    frame_cache = None
+    if args.frame_cache is not None:
+        from FrameCache import FrameCache
+        frame_cache = FrameCache(args.frame_cache, args.frame_cache_size * 1024 ** 2)
+    duplicate_filter = None
+    if args.skip_pose is not None or args.skip_phash is not None:
+        from DuplicateFilter import DuplicateFilter
+        max_translation, max_rotation = args.skip_pose or (None, None)
+        duplicate_filter = DuplicateFilter(max_translation, max_rotation, args.skip_phash)
+    return framebuffer, frame_cache, duplicate_filter
+
+
+def run(args):
+    """
+    Run the mode selected on the command line.
+
+    Parameters:
+    - args (argparse.Namespace): The parsed command line arguments.
+
     Returns:
     None
     """
+    if args.mode == "enqueue":
+        from JobQueue import enqueue_jobs, load_job_spec
+        paths = enqueue_jobs(load_job_spec(args.source), args.queue)
+        print(f"[job] queued {len(paths)} jobs in {args.queue}")
+        return
+
     init()
-    if sys.argv[1] == "dataset":
+    if args.mode == "dataset":
         png_dir = create_folder()
-        objects = load_objects_from_json("objects.json")
+        objects = load_objects_from_json("objects.json", reorder=args.tipsify)
         cameras = load_cameras_from_json("cameras.json")
-        render_with_some_cameras_dataset(objects, cameras, png_dir)
+        if args.atlas > 1:
+            # Imported here, because Atlas itself builds on this module
+            from Atlas import render_with_some_cameras_atlas
+            render_with_some_cameras_atlas(objects, cameras, png_dir, args.atlas, args.msaa, args.ssaa)
+        else:
+            render_with_some_cameras_dataset(objects, cameras, png_dir, *dataset_options(args))
 
-    elif sys.argv[1] == "obj":
+    elif args.mode == "obj":
         objects = [OBJ("models/Football.obj", swapyz=True)]
         render_with_one_camera(objects)
 
-    elif sys.argv[1] == "json":
-        objects = load_objects_from_json("objects.json")
+    elif args.mode == "json":
+        objects = load_objects_from_json("objects.json", reorder=args.tipsify)
         render_with_one_camera(objects)
 
-    elif sys.argv[1] == "cam":
+    elif args.mode == "cam":
         png_dir = create_folder()
-        if sys.argv[2] == "obj":
+        if args.source == "obj":
             objects = [OBJ("models/Football.obj", swapyz=True)]
             cameras = [Camera(id=2, position=[0, 0, -5], direction=[0, 0, -1], up_vector=[0, 1, 0], field_of_view=60.0,
                               transition_frames=60),
@@ -551,11 +890,25 @@ def main():
                               transition_frames=60)]
             render_with_some_cameras(objects, cameras, png_dir)
 
-        elif sys.argv[2] == "json":
-            objects = load_objects_from_json("objects.json")
+        elif args.source == "json":
+            objects = load_objects_from_json("objects.json", reorder=args.tipsify)
             cameras = load_cameras_from_json("cameras.json")
             render_with_some_cameras(objects, cameras, png_dir)
 
+    elif args.mode == "tiled":
+        from TiledRender import render_with_some_cameras_tiled
+        png_dir = create_folder()
+        objects = load_objects_from_json("objects.json", reorder=args.tipsify)
+        cameras = load_cameras_from_json("cameras.json")
+        render_with_some_cameras_tiled(objects, cameras, png_dir, *args.size, args.tile, args.msaa, args.ssaa)
+
+    elif args.mode == "jobs":
+        from JobQueue import load_job_spec
+        run_jobs(load_job_spec(args.source), *dataset_options(args), args.tipsify)
+
+    elif args.mode == "worker":
+        run_worker(args.queue, args.poll, *dataset_options(args), args.tipsify)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,35 @@
+from cli import BATCH_MODES, parse_args
+
+# Lekki punkt wejścia: importuje tylko to, czego potrzebuje wybrany tryb. Procesy
+# potomne (np. parsowanie modeli) importują ten plik zamiast main.py.
+
+
+def main():
+    """
+    Parse the command line and run the selected mode with the minimum of imports.
+
+    The enqueue mode never imports pygame or OpenGL. Batch modes disable PyOpenGL
+    error checking and logging (unless --debug-gl is given), which has to happen
+    before OpenGL.GL is first imported.
+
+    Returns:
+    None
+    """
+    args = parse_args()
+    if args.mode == "enqueue":
+        from JobQueue import enqueue_jobs, load_job_spec
+        paths = enqueue_jobs(load_job_spec(args.source), args.queue)
+        print(f"[job] queued {len(paths)} jobs in {args.queue}")
+        return
+
+    if args.mode in BATCH_MODES and not args.debug_gl:
+        import OpenGL
+        OpenGL.ERROR_CHECKING = False
+        OpenGL.ERROR_LOGGING = False
+
+    import main as renderer
+    renderer.main(args)
+
+
+if __name__ == "__main__":
+    main()
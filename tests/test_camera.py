@@ -0,0 +1,67 @@
+import pytest
+
+from Camera import Camera, iter_trajectory, pose_delta
+
+
+def make_camera(id, position, direction=(0, 0, -1), transition_frames=2):
+    return Camera(id, list(position), list(direction), [0, 1, 0], 60, transition_frames)
+
+
+def test_trajectory_yields_every_frame_of_every_segment():
+    cameras = [make_camera(0, [0, 0, 0], transition_frames=2), make_camera(1, [4, 0, 0], transition_frames=3)]
+    frames = [(camera.id, frame, camera.position[0]) for camera, frame in iter_trajectory(cameras)]
+    assert [(id, frame) for id, frame, _ in frames] == [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (1, 3)]
+    # Pierwsza kamera idzie do drugiej: t = 0, potem 1/2 pozostałej drogi
+    assert [x for id, _, x in frames if id == 0] == [0, 0, 2]
+    assert cameras[0].position == [4, 0, 0]
+
+
+def test_trajectory_yields_the_pose_to_render():
+    cameras = [make_camera(0, [0, 0, 0]), make_camera(1, [0, 0, -6])]
+    for camera, frame in iter_trajectory(cameras):
+        assert camera.view_matrix == camera.calculate_view_matrix()
+
+
+def test_pose_delta_identity():
+    camera = make_camera(0, [1, 2, 3])
+    translation, rotation = pose_delta(camera.position, camera.view_matrix, camera.position, camera.view_matrix)
+    assert translation == 0
+    assert rotation == pytest.approx(0, abs=1e-6)
+
+
+def test_pose_delta_known_rotation():
+    a = make_camera(0, [0, 0, 0], direction=[0, 0, -1])
+    b = make_camera(1, [1, 0, 0], direction=[1, 0, -1])
+    translation, rotation = pose_delta(a.position, a.view_matrix, b.position, b.view_matrix)
+    assert translation == pytest.approx(1.0)
+    assert rotation == pytest.approx(45.0)
+
+
+def test_same_pose_thresholds():
+    pytest.importorskip("pygame")
+    from DuplicateFilter import DuplicateFilter
+
+    duplicates = DuplicateFilter(max_translation=0.5, max_rotation=10)
+    first = make_camera(0, [0, 0, 0])
+    assert duplicates.same_pose(first) == (False, None)
+    duplicates.keep(first, "0.jpg")
+
+    skip, metrics = duplicates.same_pose(make_camera(1, [0.1, 0, 0]))
+    assert skip and metrics['translation'] == pytest.approx(0.1)
+    assert not duplicates.same_pose(make_camera(2, [1, 0, 0]))[0]
+    assert not duplicates.same_pose(make_camera(3, [0, 0, 0], direction=[1, 0, -1]))[0]
+    assert duplicates.skipped == {'pose': 1, 'phash': 0}
+
+    duplicates.reset()
+    assert duplicates.same_pose(first) == (False, None)
+    assert duplicates.skipped == {'pose': 0, 'phash': 0}
+
+
+def test_same_pose_disabled_without_thresholds():
+    pytest.importorskip("pygame")
+    from DuplicateFilter import DuplicateFilter
+
+    duplicates = DuplicateFilter()
+    camera = make_camera(0, [0, 0, 0])
+    duplicates.keep(camera, "0.jpg")
+    assert duplicates.same_pose(camera) == (False, None)
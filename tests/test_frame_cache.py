@@ -0,0 +1,67 @@
+import os
+
+from FrameCache import FrameCache, asset_digest
+
+
+def write(path, size, fill=b"x"):
+    with open(path, 'wb') as file:
+        file.write(fill * size)
+    return str(path)
+
+
+def test_fetch_miss_and_hit(tmp_path):
+    cache = FrameCache(str(tmp_path / "cache"))
+    target = str(tmp_path / "frame.jpg")
+    assert not cache.fetch("ab" * 32, target)
+    assert cache.misses == 1 and not os.path.exists(target)
+
+    cache.store("ab" * 32, write(tmp_path / "rendered.jpg", 10, b"r"))
+    assert cache.fetch("ab" * 32, target)
+    assert cache.hits == 1
+    with open(target, 'rb') as file:
+        assert file.read() == b"r" * 10
+
+
+def test_fetch_replaces_existing_target(tmp_path):
+    cache = FrameCache(str(tmp_path / "cache"))
+    cache.store("cd" * 32, write(tmp_path / "rendered.jpg", 10, b"r"))
+    target = write(tmp_path / "old.jpg", 3, b"o")
+    assert cache.fetch("cd" * 32, target)
+    with open(target, 'rb') as file:
+        assert file.read() == b"r" * 10
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = FrameCache(str(tmp_path / "cache"), max_bytes=300)
+    keys = ["a" * 64, "b" * 64, "c" * 64, "d" * 64]
+    for i, key in enumerate(keys[:3]):
+        cache.store(key, write(tmp_path / f"{i}.jpg", 100))
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    assert cache.size == 300 and cache.evictions == 0
+
+    # Trafienie odświeża najstarszy wpis, więc wypadają b i c
+    assert cache.fetch(keys[0], str(tmp_path / "hit.jpg"))
+    cache.store(keys[3], write(tmp_path / "3.jpg", 100))
+
+    assert cache.evictions == 2
+    assert cache.size == 200
+    assert [os.path.exists(cache._path(key)) for key in keys] == [True, False, False, True]
+
+
+def test_size_survives_reopening(tmp_path):
+    cache = FrameCache(str(tmp_path / "cache"))
+    cache.store("e" * 64, write(tmp_path / "rendered.jpg", 42))
+    assert FrameCache(str(tmp_path / "cache")).size == 42
+
+
+def test_asset_digest_follows_materials_and_textures(tmp_path):
+    write(tmp_path / "texture.png", 4, b"1")
+    with open(tmp_path / "model.mtl", 'w') as file:
+        file.write("newmtl m\nmap_Kd texture.png\n")
+    with open(tmp_path / "model.obj", 'w') as file:
+        file.write("mtllib model.mtl\nv 0 0 0\n")
+    digest = asset_digest(str(tmp_path / "model.obj"))
+    assert asset_digest(str(tmp_path / "model.obj")) == digest
+
+    write(tmp_path / "texture.png", 5, b"2")
+    assert asset_digest(str(tmp_path / "model.obj")) != digest
@@ -0,0 +1,38 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pygame")
+pytest.importorskip("OpenGL.GL")
+
+from FrameStream import iter_batches
+
+
+def make_frames(count, height=2, width=3, channels=3):
+    return [(np.full((height, width, channels), i, np.uint8), {'frame': i}) for i in range(count)]
+
+
+def test_batches_have_stacked_shapes():
+    batches = list(iter_batches(make_frames(6), 3))
+    assert len(batches) == 2
+    for images, metadata in batches:
+        assert images.shape == (3, 2, 3, 3) and images.dtype == np.uint8
+        assert len(metadata) == 3
+    images, metadata = batches[1]
+    assert [meta['frame'] for meta in metadata] == [3, 4, 5]
+    assert [int(image[0, 0, 0]) for image in images] == [3, 4, 5]
+
+
+def test_partial_last_batch():
+    batches = list(iter_batches(make_frames(7), 3))
+    assert [images.shape[0] for images, _ in batches] == [3, 3, 1]
+    assert batches[-1][1] == [{'frame': 6}]
+
+
+def test_drop_last():
+    batches = list(iter_batches(make_frames(7), 3, drop_last=True))
+    assert [images.shape[0] for images, _ in batches] == [3, 3]
+    assert list(iter_batches(make_frames(2), 3, drop_last=True)) == []
+
+
+def test_empty_stream():
+    assert list(iter_batches(iter(()), 4)) == []
@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from JobQueue import DONE, FAILED, PENDING, RUNNING, claim_job, enqueue_jobs, finish_job, load_job_spec, \
+    local_worker_id, release_job, requeue_stale_jobs
+
+
+def make_jobs(count):
+    return [{"objects": f"/scenes/{i}.json", "cameras": "/cameras.json", "output": f"/out/{i}"} for i in range(count)]
+
+
+def test_load_job_spec_resolves_paths_against_spec_file(tmp_path):
+    spec = tmp_path / "spec" / "jobs.json"
+    spec.parent.mkdir()
+    spec.write_text(json.dumps({"jobs": [{"objects": "objects.json", "cameras": "/abs/cameras.json",
+                                          "output": "renders/a"}]}))
+    job, = load_job_spec(str(spec))
+    assert job == {"objects": str(tmp_path / "spec" / "objects.json"), "cameras": "/abs/cameras.json",
+                   "output": str(tmp_path / "spec" / "renders" / "a")}
+
+
+def test_load_job_spec_rejects_incomplete_jobs(tmp_path):
+    spec = tmp_path / "jobs.json"
+    spec.write_text(json.dumps([{"objects": "objects.json", "output": "out"}]))
+    with pytest.raises(ValueError, match="cameras"):
+        load_job_spec(str(spec))
+
+
+def test_claim_in_order_and_finish(tmp_path):
+    queue = str(tmp_path / "queue")
+    enqueue_jobs(make_jobs(2), queue)
+
+    path, job = claim_job(queue, "w1")
+    assert job == make_jobs(2)[0]
+    assert os.path.dirname(path) == os.path.join(queue, RUNNING)
+    assert os.path.basename(path).startswith("w1__")
+    second = claim_job(queue, "w2")
+    assert second[1] == make_jobs(2)[1]
+    assert claim_job(queue, "w3") is None
+
+    done = finish_job(queue, path)
+    assert os.path.dirname(done) == os.path.join(queue, DONE)
+    failed = finish_job(queue, second[0], ValueError("broken scene"))
+    assert os.path.dirname(failed) == os.path.join(queue, FAILED)
+    with open(failed + ".error.txt") as file:
+        assert "ValueError: broken scene" in file.read()
+    assert os.listdir(os.path.join(queue, RUNNING)) == []
+
+
+def test_release_returns_job_under_its_name(tmp_path):
+    queue = str(tmp_path / "queue")
+    queued, = enqueue_jobs(make_jobs(1), queue)
+    path, _ = claim_job(queue, "w1")
+    assert release_job(queue, path) == queued
+    assert claim_job(queue, "w2")[1] == make_jobs(1)[0]
+
+
+def test_requeue_stale_jobs_of_dead_workers_only(tmp_path):
+    queue = str(tmp_path / "queue")
+    enqueue_jobs(make_jobs(2), queue)
+    # Proces, który przejął zadanie i zakończył się bez oddania go
+    subprocess.run([sys.executable, "-c", f"from JobQueue import claim_job; claim_job({queue!r})"], check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    alive, _ = claim_job(queue)
+    assert os.path.basename(alive).startswith(local_worker_id() + "__")
+
+    released = requeue_stale_jobs(queue)
+    assert len(released) == 1
+    assert os.listdir(os.path.join(queue, PENDING)) == [os.path.basename(released[0])]
+    assert os.listdir(os.path.join(queue, RUNNING)) == [os.path.basename(alive)]
+    assert requeue_stale_jobs(queue) == []
+
+
+def test_requeue_leaves_other_hosts_alone(tmp_path):
+    queue = str(tmp_path / "queue")
+    enqueue_jobs(make_jobs(1), queue)
+    claim_job(queue, "other-host-999999")
+    assert requeue_stale_jobs(queue) == []
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="needs /proc")
+def test_requeue_jobs_of_unreaped_workers(tmp_path):
+    queue = str(tmp_path / "queue")
+    enqueue_jobs(make_jobs(1), queue)
+    # Bez wait() zakończony proces zostaje zombie, dopóki rodzic go nie odbierze
+    worker = subprocess.Popen([sys.executable, "-c", f"from JobQueue import claim_job; claim_job({queue!r})"],
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        with open(f"/proc/{worker.pid}/stat") as file:
+            if file.read().rsplit(")", 1)[1].split()[0] == "Z":
+                break
+        time.sleep(0.05)
+    try:
+        assert len(requeue_stale_jobs(queue)) == 1
+    finally:
+        worker.wait()
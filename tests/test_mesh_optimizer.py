@@ -0,0 +1,91 @@
+from array import array
+from collections import Counter
+import os
+
+import pytest
+
+from MeshOptimizer import acmr, optimize_mesh, reorder_vertices, tipsify, weld
+from ObjParser import parse_obj
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+MODELS = sorted(name for name in os.listdir(MODELS_DIR) if name.endswith(".obj"))
+
+
+def canonical(triangle):
+    """Rotate a triangle so its smallest corner comes first, keeping the winding."""
+    start = triangle.index(min(triangle))
+    return triangle[start:] + triangle[:start]
+
+
+def file_triangles(parsed):
+    """Fan-triangulate the faces of a parsed OBJ into (material, corners) pairs."""
+    triangles = Counter()
+    for vertices, normals, texcoords, material in parsed['faces']:
+        corners = list(zip(vertices, texcoords, normals))
+        for i in range(1, len(corners) - 1):
+            triangles[material, canonical((corners[0], corners[i], corners[i + 1]))] += 1
+    return triangles
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_optimisation_keeps_triangles_and_winding(name):
+    parsed = parse_obj(os.path.join(MODELS_DIR, name), optimize=False, textures=False)
+    keys, indices, groups = weld(parsed)
+
+    optimized = array('I')
+    for material, start, count in groups:
+        group = tipsify(indices[start:start + count], len(keys))
+        assert len(group) == count
+        optimized.extend(group)
+    keys, optimized = reorder_vertices(keys, optimized)
+
+    triangles = Counter()
+    for material, start, count in groups:
+        for i in range(start, start + count, 3):
+            triangles[material, canonical(tuple(keys[index] for index in optimized[i:i + 3]))] += 1
+    assert triangles == file_triangles(parsed)
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_optimisation_does_not_worsen_acmr(name):
+    mesh = parse_obj(os.path.join(MODELS_DIR, name), textures=False, reorder=True)['mesh']
+    assert mesh['reordered']
+    assert mesh['acmr_after'] <= mesh['acmr_before']
+    assert len(mesh['vertex_data']) % 8 == 0
+    assert max(mesh['indices']) == len(mesh['vertex_data']) // 8 - 1
+
+
+def test_acmr_without_reuse():
+    assert acmr(array('I', range(12))) == 3.0
+
+
+def test_acmr_counts_cached_vertices_once():
+    assert acmr(array('I', [0, 1, 2, 0, 1, 2])) == 1.5
+    assert acmr(array('I', [0, 1, 2, 2, 1, 3])) == 2.0
+
+
+def test_acmr_fifo_eviction():
+    # Przy pamięci na 3 wierzchołki 0, 1 i 2 zostają wyparte przez 3, 4 i 5
+    assert acmr(array('I', [0, 1, 2, 3, 4, 5, 0, 1, 2]), cache_size=3) == 3.0
+    assert acmr(array('I', [0, 1, 2, 3, 4, 5, 0, 1, 2]), cache_size=6) == 2.0
+
+
+def test_acmr_of_empty_mesh():
+    assert acmr(array('I')) == 0.0
+
+
+def test_optimize_mesh_reports_corners():
+    parsed = {'vertices': array('f', [0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0]), 'normals': array('f'),
+              'texcoords': array('f'), 'faces': [([1, 2, 3, 4], [0] * 4, [0] * 4, None)], 'mtl': None}
+    mesh = optimize_mesh(parsed)
+    assert mesh['corners'] == 6
+    assert len(mesh['vertex_data']) == 4 * 8
+    assert not mesh['has_normals'] and not mesh['has_texcoords']
+
+
+def test_optimize_mesh_keeps_file_order_without_reorder():
+    parsed = parse_obj(os.path.join(MODELS_DIR, "Cube.obj"), optimize=False, textures=False)
+    keys, indices, groups = weld(parsed)
+    mesh = optimize_mesh(parsed)
+    assert not mesh['reordered'] and mesh['acmr_before'] is None
+    assert mesh['indices'] == indices and mesh['groups'] == groups